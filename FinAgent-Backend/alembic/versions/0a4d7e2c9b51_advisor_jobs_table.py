@@ -0,0 +1,42 @@
+"""advisor jobs table
+
+Revision ID: 0a4d7e2c9b51
+Revises: f3c8a5e2b914
+Create Date: 2025-12-10 10:14:37.280615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a4d7e2c9b51'
+down_revision: Union[str, Sequence[str], None] = 'f3c8a5e2b914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: queued advisor replies."""
+    op.create_table(
+        'advisor_jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('message_id', sa.Integer(), sa.ForeignKey('conversations.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('reply_id', sa.Integer(), sa.ForeignKey('conversations.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('status', sa.String(16), nullable=False, server_default='queued'),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index(op.f('ix_advisor_jobs_id'), 'advisor_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_advisor_jobs_user_id'), 'advisor_jobs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_advisor_jobs_user_id'), table_name='advisor_jobs')
+    op.drop_index(op.f('ix_advisor_jobs_id'), table_name='advisor_jobs')
+    op.drop_table('advisor_jobs')
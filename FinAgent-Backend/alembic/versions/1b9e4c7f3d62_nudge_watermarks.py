@@ -0,0 +1,36 @@
+"""nudge watermarks
+
+Revision ID: 1b9e4c7f3d62
+Revises: 0a4d7e2c9b51
+Create Date: 2025-12-12 09:31:22.104876
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b9e4c7f3d62'
+down_revision: Union[str, Sequence[str], None] = '0a4d7e2c9b51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: per-user watermark for the fleet nudger, and the (user_id, id) index its scan probes."""
+    op.create_table(
+        'nudge_watermarks',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('last_transaction_id', sa.Integer(), nullable=False),
+        sa.Column('alerts_sent', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_nudged_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_transactions_user_id_id', 'transactions', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_user_id_id', table_name='transactions')
+    op.drop_table('nudge_watermarks')
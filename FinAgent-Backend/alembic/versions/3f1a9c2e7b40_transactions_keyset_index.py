@@ -0,0 +1,33 @@
+"""transactions keyset index
+
+Revision ID: 3f1a9c2e7b40
+Revises: d3096dee6508
+Create Date: 2025-11-29 11:02:37.418220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1a9c2e7b40'
+down_revision: Union[str, Sequence[str], None] = 'd3096dee6508'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: composite index backing keyset pagination of transactions."""
+    op.create_index(
+        "ix_transactions_user_id_date_id",
+        "transactions",
+        ["user_id", sa.text("date DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_transactions_user_id_date_id", table_name="transactions")
@@ -0,0 +1,53 @@
+"""transaction rollups
+
+Revision ID: a91e5b3c0d27
+Revises: 7c2d4e81a9f3
+Create Date: 2025-12-01 10:44:09.117602
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91e5b3c0d27'
+down_revision: Union[str, Sequence[str], None] = '7c2d4e81a9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: per-user monthly/category rollup, backfilled from transactions."""
+    op.create_table(
+        'transaction_rollups',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('month', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('type', sa.String(10), nullable=False),
+        sa.Column('total', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('user_id', 'month', 'category', 'type'),
+    )
+
+    # Same statement as app.services.rollup_service.rebuild_rollups
+    op.execute(
+        """
+        INSERT INTO transaction_rollups (user_id, month, category, type, total, count)
+        SELECT user_id,
+               date_trunc('month', date AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+               COALESCE(category, ''),
+               type,
+               SUM(amount),
+               COUNT(*)
+        FROM transactions
+        WHERE user_id IS NOT NULL AND date IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('transaction_rollups')
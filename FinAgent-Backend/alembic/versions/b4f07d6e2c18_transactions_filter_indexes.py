@@ -0,0 +1,38 @@
+"""transactions filter indexes
+
+Revision ID: b4f07d6e2c18
+Revises: a91e5b3c0d27
+Create Date: 2025-12-02 09:13:45.730118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f07d6e2c18'
+down_revision: Union[str, Sequence[str], None] = 'a91e5b3c0d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: indexes behind the GET /transactions filters."""
+    op.create_index(
+        "ix_transactions_user_id_category_date",
+        "transactions",
+        ["user_id", "category", sa.text("date DESC")],
+        unique=False,
+    )
+    op.execute(
+        "CREATE INDEX ix_transactions_user_id_merchant_lower "
+        "ON transactions (user_id, lower(merchant) text_pattern_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_transactions_user_id_merchant_lower", table_name="transactions")
+    op.drop_index("ix_transactions_user_id_category_date", table_name="transactions")
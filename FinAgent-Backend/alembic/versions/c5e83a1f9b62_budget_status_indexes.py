@@ -0,0 +1,37 @@
+"""budget status indexes
+
+Revision ID: c5e83a1f9b62
+Revises: b4f07d6e2c18
+Create Date: 2025-12-04 14:37:22.508913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e83a1f9b62'
+down_revision: Union[str, Sequence[str], None] = 'b4f07d6e2c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: indexes behind GET /budgets/status."""
+    op.create_index(op.f("ix_budgets_user_id"), "budgets", ["user_id"], unique=False)
+    op.create_index(
+        "ix_transactions_debit_user_category_date",
+        "transactions",
+        ["user_id", "category", "date"],
+        unique=False,
+        postgresql_include=["amount"],
+        postgresql_where=sa.text("type = 'debit'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_transactions_debit_user_category_date", table_name="transactions")
+    op.drop_index(op.f("ix_budgets_user_id"), table_name="budgets")
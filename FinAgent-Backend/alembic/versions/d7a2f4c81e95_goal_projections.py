@@ -0,0 +1,41 @@
+"""goal projections
+
+Revision ID: d7a2f4c81e95
+Revises: c5e83a1f9b62
+Create Date: 2025-12-05 18:02:14.661530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a2f4c81e95'
+down_revision: Union[str, Sequence[str], None] = 'c5e83a1f9b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: precomputed goal projections."""
+    op.create_table(
+        'goal_projections',
+        sa.Column('goal_id', sa.Integer(), sa.ForeignKey('goals.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('monthly_savings_mean', sa.Float(), nullable=False),
+        sa.Column('monthly_savings_std', sa.Float(), nullable=False),
+        sa.Column('projected_completion', sa.Date(), nullable=True),
+        sa.Column('on_track_probability', sa.Float(), nullable=True),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index(op.f('ix_goal_projections_user_id'), 'goal_projections', ['user_id'], unique=False)
+    op.create_index(op.f('ix_goals_user_id'), 'goals', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_goals_user_id'), table_name='goals')
+    op.drop_index(op.f('ix_goal_projections_user_id'), table_name='goal_projections')
+    op.drop_table('goal_projections')
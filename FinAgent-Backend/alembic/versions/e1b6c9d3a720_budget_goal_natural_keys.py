@@ -0,0 +1,42 @@
+"""budget natural key
+
+Revision ID: e1b6c9d3a720
+Revises: d7a2f4c81e95
+Create Date: 2025-12-07 11:26:48.203917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b6c9d3a720'
+down_revision: Union[str, Sequence[str], None] = 'd7a2f4c81e95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: unique (user_id, category, period) budgets."""
+    op.execute("UPDATE budgets SET period = 'monthly' WHERE period IS NULL")
+    op.alter_column('budgets', 'period', existing_type=sa.String(), nullable=False, server_default='monthly')
+
+    # Keep the most recent row of any existing duplicates
+    op.execute("""
+        DELETE FROM budgets b
+        USING budgets newer
+        WHERE newer.user_id = b.user_id
+          AND newer.category = b.category
+          AND newer.period = b.period
+          AND newer.id > b.id
+    """)
+
+    op.create_unique_constraint('uq_budgets_user_id_category_period', 'budgets', ['user_id', 'category', 'period'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_budgets_user_id_category_period', 'budgets', type_='unique')
+    op.alter_column('budgets', 'period', existing_type=sa.String(), nullable=True, server_default=None)
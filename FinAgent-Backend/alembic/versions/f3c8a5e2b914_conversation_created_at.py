@@ -0,0 +1,39 @@
+"""conversation created_at
+
+Revision ID: f3c8a5e2b914
+Revises: e1b6c9d3a720
+Create Date: 2025-12-08 16:40:03.517284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8a5e2b914'
+down_revision: Union[str, Sequence[str], None] = 'e1b6c9d3a720'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: timestamp conversations and index them for history paging."""
+    # Existing rows all get the migration time; id still orders them
+    op.add_column(
+        'conversations',
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        "ix_conversations_user_id_created_at_id",
+        "conversations",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_conversations_user_id_created_at_id", table_name="conversations")
+    op.drop_column('conversations', 'created_at')
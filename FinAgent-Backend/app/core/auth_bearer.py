@@ -1,39 +1,99 @@
-from fastapi import Depends, HTTPException
+import hmac
+
+from fastapi import Depends, Header, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.cache import cache, USERS
 from app.core.config import settings
 from app.core.database import get_db
 from app.models.user import User
 
 security = HTTPBearer()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db),
-):
-    token = credentials.credentials
+# Columns cached per user; never the password hash
+IDENTITY_FIELDS = ("id", "email", "name", "occupation", "monthlyIncome", "is_active")
 
-    try:
-        # Decode JWT
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        user_id = payload.get("sub")
 
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token payload")
+class TokenUser:
+    """ Identity taken straight from access-token claims (no DB lookup) """
+
+    def __init__(self, id: int, is_active: bool = True):
+        self.id = id
+        self.is_active = is_active
 
+
+def _decode_token(credentials: HTTPAuthorizationCredentials) -> dict:
+    try:
+        # Decode JWT
+        payload = jwt.decode(credentials.credentials, settings.SECRET_KEY, algorithms=["HS256"])
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-    # Fetch user from database
-    query = select(User).where(User.id == int(user_id))
-    result = await db.execute(query)
-    user = result.scalar_one_or_none()
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Invalid token payload")
 
+    return payload
+
+
+async def _load_identity(db: AsyncSession, user_id: int):
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
     if user is None:
+        return None
+    return {field: getattr(user, field) for field in IDENTITY_FIELDS}
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+):
+    payload = _decode_token(credentials)
+    user_id = int(payload["sub"])
+
+    # Fetch user from cache, falling back to the database
+    if settings.AUTH_USER_CACHE_TTL_SECONDS > 0:
+        identity = await cache.get_or_load(
+            USERS, user_id, "identity",
+            lambda: _load_identity(db, user_id),
+            ttl=settings.AUTH_USER_CACHE_TTL_SECONDS,
+        )
+    else:
+        identity = await _load_identity(db, user_id)
+
+    if identity is None:
         raise HTTPException(status_code=404, detail="User not found")
+    if identity["is_active"] is False:
+        raise HTTPException(status_code=403, detail="User is inactive")
+
+    # RETURN FULL USER OBJECT (detached; re-select it before writing)
+    return User(**identity)
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    For endpoints that only need the caller's id. With AUTH_TOKEN_CLAIMS on,
+    the id/active claims in the access token are trusted without any lookup
+    (a deactivation then takes effect when the token expires); otherwise this
+    is get_current_user.
+    """
+    if settings.AUTH_TOKEN_CLAIMS:
+        payload = _decode_token(credentials)
+        if "active" in payload:
+            if payload["active"] is False:
+                raise HTTPException(status_code=403, detail="User is inactive")
+            return TokenUser(id=int(payload["sub"]))
+
+    return await get_current_user(credentials, db)
+
 
-    # RETURN FULL USER OBJECT
-    return user
+async def require_internal(x_internal_token: str | None = Header(None)):
+    """ Gate for operational endpoints: X-Internal-Token must match INTERNAL_STATS_TOKEN """
+    expected = settings.INTERNAL_STATS_TOKEN
+    if not expected or not x_internal_token or not hmac.compare_digest(x_internal_token, expected):
+        raise HTTPException(status_code=403, detail="Forbidden")
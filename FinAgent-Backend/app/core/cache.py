@@ -0,0 +1,217 @@
+"""
+Per-user read cache for summary/budget/goal endpoints.
+
+Entries are keyed by (scope, user, version, name). Writers call
+`invalidate(scope, user_id)`, which bumps the user's version for that scope
+so every older entry simply stops being addressed and ages out by TTL.
+
+Uses Redis when REDIS_URL is set, otherwise an in-process LRU with TTL.
+The in-process backend is single-process only: invalidations made by
+another uvicorn worker or by a Celery task (statement imports) never reach
+it, so anything beyond single-worker dev needs REDIS_URL.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# scopes: which writes invalidate which reads
+TRANSACTIONS = "transactions"
+BUDGETS = "budgets"
+GOALS = "goals"
+USERS = "users"
+
+
+class LoopLocalRedis:
+    """
+    A redis.asyncio client for whichever event loop is running. Its pooled
+    connections belong to the loop that opened them, and Celery tasks run
+    each job under a fresh asyncio.run, so a client kept from an earlier
+    task fails with "Event loop is closed". Tasks call aclose() on the way
+    out, next to engine.dispose().
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._client = None
+        self._loop = None
+
+    @property
+    def client(self):
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(self.url, decode_responses=True)
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        client, loop = self._client, self._loop
+        self._client = self._loop = None
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.aclose()
+
+
+class MemoryBackend:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # Versions come from one counter and are never reused. Past
+        # max_entries the least recently bumped are dropped and `_floor`
+        # moves to a fresh value, so a dropped key can't fall back to a
+        # version that still addresses stale entries.
+        self._versions: OrderedDict[str, int] = OrderedDict()
+        self._clock = 0
+        self._floor = 0
+
+    async def get_version(self, key: str) -> int:
+        return self._versions.get(key, self._floor)
+
+    async def bump_version(self, key: str) -> None:
+        self._clock += 1
+        self._versions[key] = self._clock
+        self._versions.move_to_end(key)
+        if len(self._versions) > self.max_entries:
+            # Drop a tenth at a time so the floor doesn't move on every bump
+            for _ in range(max(1, self.max_entries // 10)):
+                self._versions.popitem(last=False)
+            self._clock += 1
+            self._floor = self._clock
+
+    async def get(self, key: str) -> Optional[str]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisBackend:
+    def __init__(self, url: str):
+        self._redis = LoopLocalRedis(url)
+
+    @property
+    def client(self):
+        return self._redis.client
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    async def get_version(self, key: str) -> int:
+        return int(await self.client.get(key) or 0)
+
+    async def bump_version(self, key: str) -> None:
+        await self.client.incr(key)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self.client.set(key, value, ex=ttl)
+
+
+class Cache:
+    def __init__(self, backend, ttl: int, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @staticmethod
+    def _version_key(scope: str, user_id: int) -> str:
+        return f"cache:ver:{scope}:{user_id}"
+
+    async def get_or_load(
+        self,
+        scope: str,
+        user_id: int,
+        name: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+    ) -> Any:
+        """
+        Return the cached JSON value for `name`, or run `loader` (which must
+        return something json-serializable) and cache its result for `ttl`
+        seconds (default: CACHE_TTL_SECONDS).
+        """
+        if not self.enabled:
+            return await loader()
+
+        try:
+            version = await self.backend.get_version(self._version_key(scope, user_id))
+            key = f"cache:{scope}:{user_id}:v{version}:{name}"
+            raw = await self.backend.get(key)
+        except Exception:
+            # a cache outage must never take reads down with it
+            self.errors += 1
+            logger.warning("cache read failed", exc_info=True)
+            return await loader()
+
+        if raw is not None:
+            self.hits += 1
+            return json.loads(raw)
+
+        self.misses += 1
+        value = await loader()
+        try:
+            await self.backend.set(key, json.dumps(value, default=str), ttl or self.ttl)
+        except Exception:
+            self.errors += 1
+            logger.warning("cache write failed", exc_info=True)
+        return value
+
+    async def invalidate(self, scope: str, user_id: int) -> None:
+        if not self.enabled:
+            return
+        try:
+            await self.backend.bump_version(self._version_key(scope, user_id))
+        except Exception:
+            self.errors += 1
+            logger.warning("cache invalidation failed", exc_info=True)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+def _build_cache() -> Cache:
+    if settings.REDIS_URL:
+        backend = RedisBackend(settings.REDIS_URL)
+    else:
+        backend = MemoryBackend(settings.CACHE_MAX_ENTRIES)
+    return Cache(backend, ttl=settings.CACHE_TTL_SECONDS, enabled=settings.CACHE_ENABLED)
+
+
+cache = _build_cache()
@@ -2,9 +2,79 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
-    REDIS_URL: str
+    DATABASE_READ_URL: str = ""   # optional replica for GET endpoints; empty -> primary
+    DATABASE_SSL: bool = True     # Neon requires TLS; turn off for a local primary/replica
+    READ_YOUR_WRITES_SECONDS: int = 5   # pin a user to the primary after they write (0 disables)
+    REDIS_URL: str = ""   # empty -> in-process fallbacks (cache, etc.)
     SECRET_KEY: str
 
+    # Startup: "create_all" runs Base.metadata.create_all (dev); "fast" only checks the
+    # database is at the Alembic head. Either way N pooled connections are opened up
+    # front so the first requests don't pay for TLS handshakes
+    STARTUP_MODE: str = "create_all"
+    DB_POOL_WARM_CONNECTIONS: int = 5
+
+    # SQL logging: SQL_ECHO prints every statement (dev only); instrumentation keeps
+    # per-fingerprint latency histograms and logs statements slower than SLOW_QUERY_MS
+    SQL_ECHO: bool = False
+    SQL_INSTRUMENTATION: bool = True
+    SLOW_QUERY_MS: float = 200.0
+
+    # Statement imports: uploads are spooled here for the worker (must be shared storage
+    # when API and workers run on different hosts) and parsed this many rows at a time
+    IMPORT_UPLOAD_DIR: str = "/tmp/finagent-imports"
+    IMPORT_CHUNK_ROWS: int = 1000
+
+    # Operational endpoints (/cache/stats, ...) require this value in X-Internal-Token;
+    # empty keeps them closed
+    INTERNAL_STATS_TOKEN: str = ""
+
+    # Read cache for summaries/budgets/goals (app/core/cache.py)
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: int = 300
+    CACHE_MAX_ENTRIES: int = 10000   # in-process LRU only
+
+    # Authenticated-user lookups: identity is cached this long (0 disables), and with
+    # AUTH_TOKEN_CLAIMS on, id-only endpoints trust the access token's claims outright
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60
+    AUTH_TOKEN_CLAIMS: bool = False
+
+    # Password hashing: argon2 cost (None keeps passlib's defaults; changing these makes
+    # existing hashes get upgraded on the next successful login) and the size of the
+    # thread pool hashing runs in, which also caps argon2's concurrent memory use
+    ARGON2_TIME_COST: int | None = None
+    ARGON2_MEMORY_COST: int | None = None   # KiB
+    ARGON2_PARALLELISM: int | None = None
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # Advisor chat: Gemini model for streamed answers and how many recent messages of
+    # the conversation go into each prompt
+    GOOGLE_API_KEY: str = ""
+    ADVISOR_MODEL: str = "gemini-2.5-flash"
+    ADVISOR_HISTORY_MESSAGES: int = 10
+
+    # Celery: default worker concurrency for a worker consuming only that queue (an
+    # explicit -c wins), the hard time limit on one advisor job, and how often beat
+    # fails advisor jobs left "running" past that limit (killed or lost workers)
+    IMPORT_WORKER_CONCURRENCY: int = 2
+    ADVISOR_WORKER_CONCURRENCY: int = 4
+    ADVISOR_TASK_TIME_LIMIT: int = 300
+    ADVISOR_SWEEP_SECONDS: int = 60
+
+    # UTC hour of the nightly goal_projections batch (app/services/goal_forecast.py)
+    GOAL_PROJECTIONS_HOUR_UTC: int = 1
+
+    # Fleet nudger (app/services/nudger.py): users per keyset batch, users processed at
+    # once (keep within the DB pool), per-user time budget, spending window, whether to
+    # run the full LLM pipeline per user (slow) instead of the rule-based alerts, and
+    # the UTC hour of the nightly run
+    NUDGER_BATCH_SIZE: int = 1000
+    NUDGER_CONCURRENCY: int = 10
+    NUDGER_USER_TIMEOUT_SECONDS: float = 30.0
+    NUDGER_WINDOW_DAYS: int = 30
+    NUDGER_USE_LLM: bool = False
+    NUDGER_HOUR_UTC: int = 2
+
     class Config:
         env_file = ".env"
 
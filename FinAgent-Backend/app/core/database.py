@@ -1,21 +1,40 @@
+import asyncio
+import os
+
+from fastapi import Request
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.db_metrics import instrument
+from app.core.read_routing import user_id_from_request, pinned_to_primary
 import ssl
 
 DATABASE_URL = settings.DATABASE_URL
+DATABASE_READ_URL = settings.DATABASE_READ_URL or DATABASE_URL
 
 # Create SSL context (Neon requires TLS)
 ssl_ctx = ssl.create_default_context()
 
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,
-    pool_pre_ping=True,
-    pool_recycle=180,   # recycle connections every 3 minutes
-    pool_timeout=30,
-    connect_args={"ssl": ssl_ctx},   # <-- required for asyncpg
-)
+
+def _create_engine(url: str):
+    engine = create_async_engine(
+        url,
+        echo=settings.SQL_ECHO,
+        pool_pre_ping=True,
+        pool_recycle=180,   # recycle connections every 3 minutes
+        pool_timeout=30,
+        connect_args={"ssl": ssl_ctx} if settings.DATABASE_SSL else {},   # <-- required for asyncpg
+    )
+    if settings.SQL_INSTRUMENTATION:
+        instrument(engine, settings.SLOW_QUERY_MS)
+    return engine
+
+
+engine = _create_engine(DATABASE_URL)
+
+# Replica for read-only endpoints; the same engine when no replica is configured
+read_engine = _create_engine(DATABASE_READ_URL) if DATABASE_READ_URL != DATABASE_URL else engine
 
 # ---------------------------
 # Session Factory
@@ -26,6 +45,12 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+AsyncReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 # ---------------------------
 # Base Model
 # ---------------------------
@@ -39,6 +64,20 @@ async def get_db():
         yield session
 
 
+async def read_sessionmaker(request: Request):
+    """ Replica session factory, or the primary's while the caller is pinned after a write """
+    if read_engine is engine or await pinned_to_primary(user_id_from_request(request)):
+        return AsyncSessionLocal
+    return AsyncReadSessionLocal
+
+
+async def get_read_db(request: Request):
+    """ get_db for GET endpoints: routed to DATABASE_READ_URL when one is set """
+    factory = await read_sessionmaker(request)
+    async with factory() as session:
+        yield session
+
+
 # -----------------------------------------------------------
 # AUTO-CREATE TABLES (important for Neon)
 # -----------------------------------------------------------
@@ -49,3 +88,79 @@ async def init_models():
     """
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+# -----------------------------------------------------------
+# FAST STARTUP
+# -----------------------------------------------------------
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini")
+
+
+def alembic_head() -> str:
+    """ Head revision of the migration scripts shipped with this build """
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_current_head()
+
+
+async def check_schema_revision():
+    """
+    One query instead of reflecting every table: refuse to start against a
+    database that hasn't been migrated to this build's head.
+    """
+    expected = alembic_head()
+    async with engine.connect() as conn:
+        result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        current = result.scalar_one_or_none()
+
+    if current != expected:
+        raise RuntimeError(
+            f"Database is at revision {current}, expected {expected}. Run 'alembic upgrade head'."
+        )
+    return current
+
+
+async def _warm(target, n: int) -> int:
+    n = min(n, target.pool.size())
+    if n <= 0:
+        return 0
+    # Hold all n at once so the pool really opens n distinct connections
+    conns = await asyncio.gather(*(target.connect() for _ in range(n)))
+    try:
+        await asyncio.gather(*(c.execute(text("SELECT 1")) for c in conns))
+    finally:
+        await asyncio.gather(*(c.close() for c in conns))
+    return n
+
+
+async def warm_pool(n: int) -> int:
+    """ Open up to `n` connections per engine in parallel before taking traffic """
+    opened = await _warm(engine, n)
+    if read_engine is not engine:
+        opened += await _warm(read_engine, n)
+    return opened
+
+
+# -----------------------------------------------------------
+# READINESS
+# -----------------------------------------------------------
+async def _ping(target, timeout: float) -> bool:
+    async def run():
+        async with target.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.wait_for(run(), timeout)
+        return True
+    except Exception:
+        return False
+
+
+async def ping_databases(timeout: float = 2.0) -> dict:
+    """ SELECT 1 through each pool; the replica only appears when one is configured """
+    checks = {"primary": engine}
+    if read_engine is not engine:
+        checks["replica"] = read_engine
+    results = await asyncio.gather(*(_ping(target, timeout) for target in checks.values()))
+    return dict(zip(checks, results))
@@ -0,0 +1,155 @@
+"""
+SQLAlchemy event-based query instrumentation.
+
+Records latency histograms per statement fingerprint (literals and bind
+markers collapsed to `?`), counts queries per request via a context
+variable, and logs anything slower than SLOW_QUERY_MS to the
+"finagent.slow_query" logger. Everything is readable in-process:
+
+    with count_queries() as counter:
+        ...                                 # exercise an endpoint
+    assert counter.count <= 3
+
+    query_stats()                           # {fingerprint: {...}}
+"""
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+slow_query_logger = logging.getLogger("finagent.slow_query")
+
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float("inf"))
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s|(?<!:):(?!:)\w+|%s")
+_VALUES_RE = re.compile(r"(\([?, ]+\))(?:\s*,\s*\([?, ]+\))+")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """ Normalize a statement so executions that differ only in values group together """
+    s = _STRING_RE.sub("?", statement)
+    s = _PARAM_RE.sub("?", s)
+    s = _NUMBER_RE.sub("?", s)
+    s = _SPACE_RE.sub(" ", s).strip()
+    s = _VALUES_RE.sub(r"\1, ...", s)       # multi-row VALUES of any length
+    s = _IN_LIST_RE.sub("(?, ...)", s)      # IN lists of any length
+    return s
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.statements: list[str] = []
+
+
+class _Histogram:
+    __slots__ = ("count", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * len(BUCKETS_MS)
+
+    def observe(self, ms: float):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": {
+                ("+Inf" if bound == float("inf") else f"le_{bound}ms"): n
+                for bound, n in zip(BUCKETS_MS, self.buckets)
+            },
+        }
+
+
+_lock = threading.Lock()
+_histograms: dict[str, _Histogram] = {}
+_current: ContextVar[Optional[QueryCounter]] = ContextVar("sql_query_counter", default=None)
+_slow_query_ms = 200.0
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    key = fingerprint(statement)
+
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = _Histogram()
+        hist.observe(elapsed_ms)
+
+    counter = _current.get()
+    if counter is not None:
+        counter.count += 1
+        counter.total_ms += elapsed_ms
+        counter.statements.append(key)
+
+    if elapsed_ms >= _slow_query_ms:
+        slow_query_logger.warning("slow query %.1f ms: %s", elapsed_ms, key)
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start
+    # time so the next statement on this connection isn't timed against it
+    conn = context.connection
+    if conn is None or context.execution_context is None or context.is_pre_ping:
+        return   # connect/ping failures: before_cursor_execute never ran
+    starts = conn.info.get("query_start_time")
+    if starts:
+        starts.pop()
+
+
+def instrument(engine, slow_query_ms: float) -> None:
+    """ Attach the listeners to an (async or sync) engine """
+    global _slow_query_ms
+    _slow_query_ms = slow_query_ms
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def count_queries():
+    """ Count every statement executed in this context (request, test, task) """
+    counter = QueryCounter()
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
+
+
+def query_stats() -> dict:
+    with _lock:
+        return {key: hist.as_dict() for key, hist in _histograms.items()}
+
+
+def reset_query_stats() -> None:
+    with _lock:
+        _histograms.clear()
@@ -0,0 +1,53 @@
+"""
+Read-your-writes stickiness for replica routing.
+
+After a user's successful write, `mark_write` pins that user to the primary
+for READ_YOUR_WRITES_SECONDS so their next reads can't see a replica that
+is still catching up (and can't re-fill the cache with pre-write data).
+Markers live in the cache backend, so with Redis they hold across workers.
+"""
+import logging
+from typing import Optional
+
+from fastapi import Request
+from jose import jwt
+
+from app.core.cache import cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def user_id_from_request(request: Request) -> Optional[int]:
+    # Routing only, never authorization: the signature is checked by the
+    # auth dependency, so unverified claims are enough to pick an engine
+    auth = request.headers.get("authorization", "")
+    if not auth.lower().startswith("bearer "):
+        return None
+    try:
+        return int(jwt.get_unverified_claims(auth[7:]).get("sub"))
+    except Exception:
+        return None
+
+
+def _key(user_id: int) -> str:
+    return f"sticky:primary:{user_id}"
+
+
+async def mark_write(user_id: int) -> None:
+    if settings.READ_YOUR_WRITES_SECONDS <= 0:
+        return
+    try:
+        await cache.backend.set(_key(user_id), "1", settings.READ_YOUR_WRITES_SECONDS)
+    except Exception:
+        logger.warning("could not record read-your-writes marker", exc_info=True)
+
+
+async def pinned_to_primary(user_id: Optional[int]) -> bool:
+    if user_id is None or settings.READ_YOUR_WRITES_SECONDS <= 0:
+        return False
+    try:
+        return await cache.backend.get(_key(user_id)) is not None
+    except Exception:
+        # can't tell: the primary is always correct
+        return True
@@ -2,115 +2,57 @@
 Financial Coach AI Agent v2 (Advisor + Proactive Nudger)
 
 - Reads DATABASE_URL & GOOGLE_API_KEY from .env
-- Fetches user_profile and transactions from Neon
+- Fetches user_profile and transactions from Neon through the backend's
+  pooled async engine (run from FinAgent-Backend:
+  python -m app.langgraph.Financial_Coaching_Agent)
 - Uses LangGraph + Gemini for financial coaching
 - Supports two modes via AGENT_MODE env var:
     - advisor : interactive CLI coach (Level 1)
-    - nudger  : proactive alert run (Level 2)
+    - nudger  : proactive alert run for one user (Level 2; the nightly
+                fleet-wide pass is app.services.nudger)
 """
 
-from typing import TypedDict, Annotated, List, Dict
+from typing import TypedDict, Annotated, List, Dict, Optional, Tuple
 from langgraph.graph import StateGraph, END
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
+import asyncio
 import operator
 import json
 import os
-from datetime import datetime, timedelta
 
-import psycopg2
-import psycopg2.extras
 from dotenv import load_dotenv
 
 # ========= LOAD ENV (.env + system env) ========= #
 
 load_dotenv()
 
-# ========= POSTGRES (NEON) HELPERS ========= #
+# ========= DATA ACCESS (app's pooled async engine) ========= #
 
-def get_db_connection():
-    """
-    Create a PostgreSQL connection using Neon DATABASE_URL.
-    """
-    db_url = os.environ.get("DATABASE_URL")
-    if not db_url:
-        raise RuntimeError("DATABASE_URL env var not set.")
+from app.core.database import AsyncSessionLocal
+from app.services.advisor_service import load_agent_inputs
 
-    conn = psycopg2.connect(db_url)
-    return conn
+# One loop for the process so pooled connections (bound to the loop that
+# opened them) are reused across runs instead of reconnecting every fetch
+_loop: Optional[asyncio.AbstractEventLoop] = None
 
 
-def get_user_profile_from_db(user_id: int) -> Dict:
+def fetch_agent_inputs(user_id: int, days: int = 30, fallback_days: Optional[int] = 365) -> Tuple[Dict, List[Dict]]:
     """
-    Fetch user profile from Neon Postgres in a schema-tolerant way.
-
-    SELECT * FROM users WHERE id = %s LIMIT 1;
-
-    Returns at least:
-      - id
-      - name (fallback "User")
-      - type (fallback "user")
+    (user_profile, transactions) for the last `days` days, or the last
+    `fallback_days` if that window is empty, in one round trip on a pooled
+    connection. See app.services.advisor_service.load_agent_inputs.
     """
-    conn = get_db_connection()
-    try:
-        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            cur.execute("SELECT * FROM users WHERE id = %s LIMIT 1;", (user_id,))
-            row = cur.fetchone()
-
-            if not row:
-                return {"id": user_id, "name": "Unknown User", "type": "user"}
+    async def _fetch():
+        async with AsyncSessionLocal() as db:
+            return await load_agent_inputs(db, user_id, days, fallback_days)
 
-            profile = dict(row)
-            profile["name"] = profile.get("name") or "User"
-            profile["type"] = profile.get("type") or "user"
-            return profile
-    finally:
-        conn.close()
-
-
-def get_transactions_from_db(user_id: int, days: int = 30) -> List[Dict]:
-    """
-    Fetch categorized transactions from Neon Postgres for the last `days` days.
-
-    Expected minimal schema for `transactions`:
-      id | amount | type | date | source | user_id | merchant | category
-    """
-    conn = get_db_connection()
-    try:
-        cutoff = datetime.utcnow() - timedelta(days=days)
-        print(f"[DEBUG] Fetching transactions for user_id={user_id}, last {days} days (cutoff={cutoff})")
-
-        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            cur.execute(
-                """
-                SELECT id, amount, type, date, source, user_id, merchant, category
-                FROM transactions
-                WHERE user_id = %s
-                  AND date >= %s
-                ORDER BY date DESC;
-                """,
-                (user_id, cutoff),
-            )
-
-            rows = cur.fetchall()
-            print(f"[DEBUG] Found {len(rows)} transactions in DB")
-
-            txns: List[Dict] = []
-            for r in rows:
-                txns.append(
-                    {
-                        "id": r["id"],
-                        "amount": float(r["amount"]) if r["amount"] is not None else 0.0,
-                        "type": r.get("type"),  # 'income' or 'expense'
-                        "category": r.get("category") or "Other",
-                        "merchant": r.get("merchant"),
-                        "date": r["date"].isoformat() if isinstance(r["date"], datetime) else str(r["date"]),
-                        "source": r.get("source"),
-                    }
-                )
-            return txns
-    finally:
-        conn.close()
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    profile, transactions = _loop.run_until_complete(_fetch())
+    print(f"[DEBUG] Found {len(transactions)} transactions for user_id={user_id} (window {profile.get('window_days', days)} days)")
+    return profile, transactions
 
 
 # ========= LANGGRAPH AGENT ========= #
@@ -127,11 +69,11 @@ class AgentState(TypedDict):
 
 
 class FinancialCoachAgent:
-    def __init__(self, api_key: str, model: str = "gemini-2.5-flash"):
+    def __init__(self, api_key: str = None, model: str = "gemini-2.5-flash", llm=None):
         """
-        Initialize the Financial Coach Agent
+        Initialize the Financial Coach Agent (pass `llm` to use another chat model)
         """
-        self.llm = ChatGoogleGenerativeAI(
+        self.llm = llm or ChatGoogleGenerativeAI(
             google_api_key=api_key,
             model=model,
             temperature=0.7,
@@ -140,27 +82,44 @@ class FinancialCoachAgent:
 
     # ---------- Graph definition ---------- #
 
-    def _build_graph(self):
+    # Each node lists the nodes whose output it reads. Nodes return only the
+    # keys they produce, so nodes whose inputs are ready run in the same step:
+    # build_budget only needs spending_analysis and runs alongside
+    # generate_insights -> create_recommendations; generate_coaching waits for both.
+    NODE_DEPENDENCIES = {
+        "analyze_spending": [],
+        "generate_insights": ["analyze_spending"],
+        "create_recommendations": ["generate_insights"],
+        "build_budget": ["analyze_spending"],
+        "generate_coaching": ["create_recommendations", "build_budget"],
+    }
+
+    def _build_graph(self, dependencies: Dict[str, List[str]] = None):
+        dependencies = dependencies or self.NODE_DEPENDENCIES
         workflow = StateGraph(AgentState)
 
-        workflow.add_node("analyze_spending", self.analyze_spending)
-        workflow.add_node("generate_insights", self.generate_insights)
-        workflow.add_node("create_recommendations", self.create_recommendations)
-        workflow.add_node("build_budget", self.build_budget)
-        workflow.add_node("generate_coaching", self.generate_coaching)
+        for node in dependencies:
+            workflow.add_node(node, getattr(self, node))
 
-        workflow.set_entry_point("analyze_spending")
-        workflow.add_edge("analyze_spending", "generate_insights")
-        workflow.add_edge("generate_insights", "create_recommendations")
-        workflow.add_edge("create_recommendations", "build_budget")
-        workflow.add_edge("build_budget", "generate_coaching")
-        workflow.add_edge("generate_coaching", END)
+        for node, deps in dependencies.items():
+            if not deps:
+                workflow.set_entry_point(node)
+            elif len(deps) == 1:
+                workflow.add_edge(deps[0], node)
+            else:
+                # join: runs once every dependency has finished
+                workflow.add_edge(deps, node)
+
+        needed = {dep for deps in dependencies.values() for dep in deps}
+        for node in dependencies:
+            if node not in needed:
+                workflow.add_edge(node, END)
 
         return workflow.compile()
 
     # ---------- Node: Analyze Spending ---------- #
 
-    def analyze_spending(self, state: AgentState) -> AgentState:
+    def analyze_spending(self, state: AgentState) -> Dict:
         """
         Analyze spending patterns from transactions and compute:
         - total_spent
@@ -203,12 +162,11 @@ class FinancialCoachAgent:
             "transaction_count": len(transactions),
         }
 
-        state["spending_analysis"] = analysis
-        return state
+        return {"spending_analysis": analysis}
 
     # ---------- Node: Generate Insights ---------- #
 
-    def generate_insights(self, state: AgentState) -> AgentState:
+    def generate_insights(self, state: AgentState) -> Dict:
         analysis = state["spending_analysis"]
         profile = state["user_profile"]
         profile_type = profile.get("type", "user")
@@ -240,12 +198,11 @@ Return insights as a JSON array of strings.
         except Exception:
             insights = [response.content]
 
-        state["insights"] = insights
-        return state
+        return {"insights": insights}
 
     # ---------- Node: Create Recommendations ---------- #
 
-    def create_recommendations(self, state: AgentState) -> AgentState:
+    def create_recommendations(self, state: AgentState) -> Dict:
         analysis = state["spending_analysis"]
         profile = state["user_profile"]
         insights = state["insights"]
@@ -276,12 +233,11 @@ Return recommendations as a JSON array of strings. Each recommendation should be
         except Exception:
             recommendations = [response.content]
 
-        state["recommendations"] = recommendations
-        return state
+        return {"recommendations": recommendations}
 
     # ---------- Node: Build Budget Plan ---------- #
 
-    def build_budget(self, state: AgentState) -> AgentState:
+    def build_budget(self, state: AgentState) -> Dict:
         analysis = state["spending_analysis"]
         profile = state["user_profile"]
 
@@ -321,12 +277,11 @@ Return as JSON with this structure:
                 "financial_goal": "Build an emergency fund",
             }
 
-        state["budget_plan"] = budget_plan
-        return state
+        return {"budget_plan": budget_plan}
 
     # ---------- Node: Generate Final Coaching Message ---------- #
 
-    def generate_coaching(self, state: AgentState) -> AgentState:
+    def generate_coaching(self, state: AgentState) -> Dict:
         profile = state["user_profile"]
         insights = state["insights"]
         recommendations = state["recommendations"]
@@ -354,9 +309,7 @@ Context:
 Write the complete coaching message as plain text (not JSON).
 """
         response = self.llm.invoke([HumanMessage(content=prompt)])
-        state["final_coaching"] = response.content
-
-        return state
+        return {"final_coaching": response.content}
 
     # ---------- Public: Main coaching pipeline ---------- #
 
@@ -387,9 +340,45 @@ Write the complete coaching message as plain text (not JSON).
             "coaching_message": final_state["final_coaching"],
         }
 
+    # ---------- Follow-up questions ---------- #
+
+    def followup_prompt(self, user_profile: Dict, result: Dict, question: str) -> str:
+        """
+        Prompt for answering a user's question in the context of a coach() result.
+        """
+        return f"""
+You are the same supportive financial coach who generated the analysis and plan below.
+
+USER PROFILE:
+{json.dumps(user_profile, indent=2)}
+
+SPENDING ANALYSIS:
+{json.dumps(result["spending_analysis"], indent=2)}
+
+INSIGHTS:
+{json.dumps(result["insights"], indent=2)}
+
+RECOMMENDATIONS:
+{json.dumps(result["recommendations"], indent=2)}
+
+BUDGET PLAN:
+{json.dumps(result["budget_plan"], indent=2)}
+
+Now the user is asking a follow-up question.
+Answer as the same friendly coach, in a clear, conversational way (3–6 sentences).
+Don't repeat all the numbers unless it's needed; focus on being helpful and practical.
+
+User's question: {question}
+"""
+
+    def answer(self, user_profile: Dict, result: Dict, question: str) -> str:
+        response = self.llm.invoke([HumanMessage(content=self.followup_prompt(user_profile, result, question))])
+        return response.content
+
     # ---------- New: Generate alerts for Proactive Nudger ---------- #
 
-    def generate_alerts(self, result: Dict) -> List[str]:
+    @staticmethod
+    def generate_alerts(result: Dict) -> List[str]:
         """
         Simple rule-based alert engine (Level 2: Proactive nudger).
 
@@ -467,12 +456,8 @@ def run_advisor_cli(agent: FinancialCoachAgent, user_id: int, days: int):
     """
     print(f"Fetching profile + last {days} days transactions for user_id={user_id}...")
 
-    user_profile = get_user_profile_from_db(user_id)
-    transactions = get_transactions_from_db(user_id, days)
-
-    if not transactions:
-        print(f"No transactions in last {days} days. Retrying with 365 days...")
-        transactions = get_transactions_from_db(user_id, 365)
+    # Falls back to the last 365 days in the same query when `days` is empty
+    user_profile, transactions = fetch_agent_inputs(user_id, days, 365)
 
     if not transactions:
         print("Still no transactions found. Check your DB.")
@@ -500,32 +485,12 @@ def run_advisor_cli(agent: FinancialCoachAgent, user_id: int, days: int):
             print("Coach: It was great talking with you. Keep going, you're on the right path! 👋")
             break
 
-        chat_prompt = f"""
-You are the same supportive financial coach who generated the analysis and plan below.
-
-USER PROFILE:
-{json.dumps(user_profile, indent=2)}
-
-SPENDING ANALYSIS:
-{json.dumps(result["spending_analysis"], indent=2)}
-
-INSIGHTS:
-{json.dumps(result["insights"], indent=2)}
-
-RECOMMENDATIONS:
-{json.dumps(result["recommendations"], indent=2)}
-
-BUDGET PLAN:
-{json.dumps(result["budget_plan"], indent=2)}
-
-Now the user is asking a follow-up question.
-Answer as the same friendly coach, in a clear, conversational way (3–6 sentences).
-Don't repeat all the numbers unless it's needed; focus on being helpful and practical.
-
-User's question: {user_input}
-"""
-        resp = agent.llm.invoke([HumanMessage(content=chat_prompt)])
-        print("\nCoach:", resp.content, "\n")
+        chat_prompt = agent.followup_prompt(user_profile, result, user_input)
+        # Print tokens as they arrive instead of waiting for the whole answer
+        print("\nCoach: ", end="", flush=True)
+        for chunk in agent.llm.stream([HumanMessage(content=chat_prompt)]):
+            print(chunk.content, end="", flush=True)
+        print("\n")
 
 
 def run_proactive_nudger(agent: FinancialCoachAgent, user_id: int, days: int):
@@ -537,8 +502,7 @@ def run_proactive_nudger(agent: FinancialCoachAgent, user_id: int, days: int):
     """
     print(f"[NUDGER] Running proactive check for user_id={user_id} (last {days} days)...")
 
-    user_profile = get_user_profile_from_db(user_id)
-    transactions = get_transactions_from_db(user_id, days)
+    user_profile, transactions = fetch_agent_inputs(user_id, days, fallback_days=None)
 
     if not transactions:
         print("[NUDGER] No transactions found in this period. Nothing to alert.")
@@ -1,16 +1,28 @@
 # main.py (drop into project root; rename previous app.py)
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.database import init_models
+import logging
+import time
+from app.core.database import init_models, check_schema_revision, warm_pool
+from app.core.auth_bearer import require_internal
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.db_metrics import count_queries, query_stats
+from app.core.read_routing import mark_write, user_id_from_request
 from app.routers import (
     auth_router,
     users_router,
     transactions_router,
     budgets_router,
     goals_router,
-    advisor_router
+    advisor_router,
+    dashboard_router,
+    health_router
 )
 from app.routers import advisor
+from app.workers.ws import router as ws_router, broker
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="FinAgent Backend")
 
@@ -21,19 +33,78 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Before-Cursor", "X-After-Cursor", "X-DB-Queries", "X-DB-Time-Ms"],
 )
 
+@app.middleware("http")
+async def sql_query_count(request: Request, call_next):
+    # Per-request statement count, surfaced for clients/tests as a header
+    if not settings.SQL_INSTRUMENTATION:
+        return await call_next(request)
+    with count_queries() as counter:
+        response = await call_next(request)
+    response.headers["X-DB-Queries"] = str(counter.count)
+    response.headers["X-DB-Time-Ms"] = f"{counter.total_ms:.1f}"
+    return response
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    # A successful write pins this user's reads to the primary for a few seconds
+    if request.method in ("POST", "PUT", "PATCH", "DELETE") and response.status_code < 400:
+        user_id = user_id_from_request(request)
+        if user_id is not None:
+            await mark_write(user_id)
+    return response
+
 @app.on_event("startup")
 async def on_startup():
-    await init_models()
+    t0 = time.perf_counter()
+    if settings.STARTUP_MODE == "fast":
+        await check_schema_revision()
+    else:
+        await init_models()
+    t1 = time.perf_counter()
+
+    warmed = await warm_pool(settings.DB_POOL_WARM_CONNECTIONS)
+    t2 = time.perf_counter()
+
+    app.state.startup_timings = {
+        "mode": settings.STARTUP_MODE,
+        "schema_ms": round((t1 - t0) * 1000, 1),
+        "pool_warm_ms": round((t2 - t1) * 1000, 1),
+        "pool_connections": warmed,
+        "total_ms": round((t2 - t0) * 1000, 1),
+    }
+    logger.info("startup complete: %s", app.state.startup_timings)
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await broker.close()
+    await cache.close()
 
 @app.get("/")
 def home():
     return {"message": "backend running"}
 
+@app.get("/cache/stats", dependencies=[Depends(require_internal)])
+def cache_stats():
+    return cache.stats()
+
+@app.get("/sql/stats", dependencies=[Depends(require_internal)])
+def sql_stats():
+    return query_stats()
+
+@app.get("/ws/stats", dependencies=[Depends(require_internal)])
+def ws_stats():
+    return broker.stats()
+
 app.include_router(auth_router)
 app.include_router(users_router, prefix="/users", tags=["users"])
 app.include_router(transactions_router)
 app.include_router(budgets_router)
 app.include_router(goals_router)
 app.include_router(advisor_router)
+app.include_router(ws_router)
+app.include_router(dashboard_router)
+app.include_router(health_router)
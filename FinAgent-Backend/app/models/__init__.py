@@ -1,5 +1,10 @@
 from .user import User
 from .transactions import Transaction
 from .refresh_token import RefreshToken
+from .import_job import ImportJob
+from .transaction_rollup import TransactionRollup
+from .goal_projection import GoalProjection
+from .advisor_job import AdvisorJob
+from .nudge_watermark import NudgeWatermark
 
-__all__ = ["User", "Transaction", "RefreshToken"]
+__all__ = ["User", "Transaction", "RefreshToken", "ImportJob", "TransactionRollup", "GoalProjection", "AdvisorJob", "NudgeWatermark"]
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+from app.models.conversation import Conversation
+
+class AdvisorJob(Base):
+    __tablename__ = "advisor_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    message_id = Column(Integer, ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False)
+    reply_id = Column(Integer, ForeignKey("conversations.id", ondelete="SET NULL"), nullable=True)
+    status = Column(String(16), nullable=False, default="queued")  # queued | running | done | failed
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    reply = relationship(Conversation, foreign_keys=[reply_id], lazy="joined")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -6,9 +6,14 @@ class Budget(Base):
     __tablename__ = "budgets"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     category = Column(String, nullable=False)
     amount = Column(Float, nullable=False)
-    period = Column(String, default="monthly")  # monthly, weekly, yearly
+    period = Column(String, nullable=False, default="monthly", server_default="monthly")  # monthly, weekly, yearly
+
+    __table_args__ = (
+        # Natural key for PUT /budgets upserts
+        UniqueConstraint("user_id", "category", "period", name="uq_budgets_user_id_category_period"),
+    )
 
     user = relationship("User")
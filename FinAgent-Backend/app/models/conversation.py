@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -9,3 +10,9 @@ class Conversation(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     sender = Column(String, nullable=False)   # "user" or "advisor"
     message = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # history paging: WHERE user_id = ? AND (created_at, id) < / > (?, ?)
+        Index("ix_conversations_user_id_created_at_id", user_id, created_at.desc(), id.desc()),
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class GoalProjection(Base):
+    __tablename__ = "goal_projections"
+
+    goal_id = Column(Integer, ForeignKey("goals.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    monthly_savings_mean = Column(Float, nullable=False)
+    monthly_savings_std = Column(Float, nullable=False)
+    projected_completion = Column(Date, nullable=True)       # None: savings aren't growing
+    on_track_probability = Column(Float, nullable=True)      # None: goal has no deadline
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
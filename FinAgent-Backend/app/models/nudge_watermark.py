@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class NudgeWatermark(Base):
+    """
+    Highest transaction id the nudger has looked at for each user; a user
+    whose newest transaction is not above it is skipped on the next pass.
+    """
+    __tablename__ = "nudge_watermarks"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    last_transaction_id = Column(Integer, nullable=False)
+    alerts_sent = Column(Integer, nullable=False, default=0)
+    last_nudged_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from app.core.database import Base
+
+class TransactionRollup(Base):
+    """
+    Per-user monthly totals by category and type, kept in step with
+    `transactions` by transaction_service so the summary endpoints never
+    have to scan raw rows.
+    """
+    __tablename__ = "transaction_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(DateTime(timezone=True), primary_key=True)  # first instant of the month, UTC
+    category = Column(String, primary_key=True)  # "" stands in for uncategorized
+    type = Column(String(10), primary_key=True)  # debit | credit
+    total = Column(Float, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -14,3 +14,26 @@ class Transaction(Base):
     source = Column(String, nullable=False, default="manual")  # manual | csv | sms
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    __table_args__ = (
+        # keyset pagination: WHERE user_id = ? AND (date, id) < (?, ?) ORDER BY date DESC, id DESC
+        Index("ix_transactions_user_id_date_id", user_id, date.desc(), id.desc()),
+        # fleet nudger: newest transaction id per user, one backward probe
+        Index("ix_transactions_user_id_id", user_id, id),
+        # ?category=...: per-category range scans, still in date order
+        Index("ix_transactions_user_id_category_date", user_id, category, date.desc()),
+        # ?merchant=<prefix>: LIKE 'prefix%' on lower(merchant) needs text_pattern_ops
+        Index(
+            "ix_transactions_user_id_merchant_lower",
+            user_id,
+            func.lower(merchant).label("merchant_lower"),
+            postgresql_ops={"merchant_lower": "text_pattern_ops"},
+        ),
+        # budget status: debit sums per (category, period window), index-only
+        Index(
+            "ix_transactions_debit_user_category_date",
+            user_id, category, date,
+            postgresql_include=["amount"],
+            postgresql_where=(type == "debit"),
+        ),
+    )
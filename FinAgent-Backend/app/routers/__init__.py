@@ -4,6 +4,8 @@ from .transactions import router as transactions_router
 from .budgets import router as budgets_router
 from .goals import router as goals_router
 from .advisor import router as advisor_router
+from .dashboard import router as dashboard_router
+from .health import router as health_router
 
 __all__ = [
     "auth_router",
@@ -12,4 +14,6 @@ __all__ = [
     "budgets_router",
     "goals_router",
     "advisor_router",
+    "dashboard_router",
+    "health_router",
 ]
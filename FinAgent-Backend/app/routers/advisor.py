@@ -1,12 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db, AsyncSessionLocal
 from app.models.conversation import Conversation
 from app.models.user import User
-from app.core.auth_bearer import get_current_user
-from app.schemas.conversation import MessageCreate, AdvisorReply
+from app.models.advisor_job import AdvisorJob
+from app.core.auth_bearer import get_current_principal
+from app.schemas.conversation import MessageCreate, AdvisorReply, MessageOut, AdvisorJobOut
+from app.workers.ws import publish_message
+from app.services.conversation_service import list_messages, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services.advisor_service import build_chat_prompt, stream_reply
+from workers.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/advisor", tags=["advisor"])
 
@@ -16,7 +26,7 @@ router = APIRouter(prefix="/advisor", tags=["advisor"])
 async def send_message(
     data: MessageCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_principal)
 ):
     new_msg = Conversation(
         user_id=current_user.id,
@@ -25,15 +35,75 @@ async def send_message(
     )
 
     db.add(new_msg)
+    await db.flush()
+
+    # The reply is written by an advisor worker; poll /advisor/jobs/{job_id}
+    # or listen on /advisor/ws for it
+    job = AdvisorJob(user_id=current_user.id, message_id=new_msg.id, status="queued")
+    db.add(job)
     await db.commit()
     await db.refresh(new_msg)
+    await publish_message(new_msg)   # echo to the user's other devices
+
+    try:
+        celery_app.send_task("workers.tasks.advisor_tasks.run_advisor", args=[job.id])
+    except Exception:
+        # Broker unreachable: no worker will ever pick this job up
+        logger.warning("could not enqueue advisor job %s", job.id, exc_info=True)
+        job.status = "failed"
+        job.error = "could not be queued"
+        await db.commit()
+        raise HTTPException(status_code=503, detail="Advisor is unavailable right now; your message was saved")
 
     return {
         "message": "Message sent!",
-        "data": {"id": new_msg.id, "text": new_msg.message}
+        "data": {"id": new_msg.id, "text": new_msg.message},
+        "job_id": job.id,
     }
 
 
+@router.get("/jobs/{job_id}", response_model=AdvisorJobOut)
+async def advisor_job_status(
+    job_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_principal)
+):
+    result = await db.execute(
+        select(AdvisorJob).where(AdvisorJob.id == job_id, AdvisorJob.user_id == current_user.id)
+    )
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Advisor job not found")
+    return job
+
+
+# USER → ADVISOR, ANSWER STREAMED AS SERVER-SENT EVENTS
+@router.post("/stream")
+async def stream_message(
+    data: MessageCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_principal)
+):
+    """
+    Events: `token` ({"text"}) as the model produces them, then `done`
+    ({"id", "created_at"} of the stored reply) or `error`.
+    """
+    # Prompt first so the recent-history part doesn't repeat the question
+    prompt = await build_chat_prompt(db, current_user.id, data.message)
+
+    new_msg = Conversation(user_id=current_user.id, sender="user", message=data.message)
+    db.add(new_msg)
+    await db.commit()
+    await db.refresh(new_msg)
+    await publish_message(new_msg)
+
+    return StreamingResponse(
+        stream_reply(AsyncSessionLocal, current_user.id, prompt),
+        media_type="text/event-stream",
+        # no proxy buffering, or the first token waits for the whole answer
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # ADVISOR → USER REPLY
 @router.post("/reply/{user_id}")
 async def advisor_reply(
@@ -57,5 +127,32 @@ async def advisor_reply(
     db.add(reply)
     await db.commit()
     await db.refresh(reply)
+    await publish_message(reply)
 
     return {"message": "Reply saved!", "reply": reply.message}
+
+
+# CONVERSATION HISTORY
+# /conversations is what the mobile client already calls
+@router.get("/messages", response_model=list[MessageOut])
+@router.get("/conversations", response_model=list[MessageOut], include_in_schema=False)
+async def get_messages(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    before: str | None = Query(None, description="cursor: older messages"),
+    after: str | None = Query(None, description="cursor: newer messages"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_principal)
+):
+    try:
+        rows, before_cursor, after_cursor = await list_messages(db, current_user.id, limit, before, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Body stays a plain list, oldest first; pass these back as ?before= / ?after=
+    if before_cursor:
+        response.headers["X-Before-Cursor"] = before_cursor
+    if after_cursor:
+        response.headers["X-After-Cursor"] = after_cursor
+
+    return rows
@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from jose import jwt
 
 from app.core.database import get_db
 from app.schemas.auth import LoginRequest, TokenResponse, RefreshRequest
@@ -10,11 +9,16 @@ from app.core.auth_bearer import get_current_user
 from app.services.auth_service import (
     authenticate_user,
     create_access_token,
-    create_refresh_token,
-    hash_password
+    hash_password_async
+)
+from app.services.token_service import (
+    issue_refresh_token,
+    rotate_refresh_token,
+    revoke_refresh_token,
+    InvalidRefreshToken
 )
 from app.models.user import User
-from app.core.config import settings
+from app.core.cache import cache, USERS
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -31,7 +35,7 @@ async def register_user(data: UserCreate, db: AsyncSession = Depends(get_db)):
     new_user = User(
         email=data.email,
         name=data.name,
-        hashed_password=hash_password(data.password),
+        hashed_password=await hash_password_async(data.password),
     )
 
     db.add(new_user)
@@ -60,6 +64,7 @@ async def update_profile(
         setattr(user, key, value)
 
     await db.commit()
+    await cache.invalidate(USERS, user.id)
     await db.refresh(user)
 
     return {
@@ -76,8 +81,10 @@ async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    access = create_access_token({"sub": str(user.id)})
-    refresh = create_refresh_token({"sub": str(user.id)})
+    # "active" lets id-only endpoints skip the user lookup (AUTH_TOKEN_CLAIMS)
+    access = create_access_token({"sub": str(user.id), "active": user.is_active is not False})
+    refresh = await issue_refresh_token(db, user.id)
+    await db.commit()
 
     return TokenResponse(
         access_token=access,
@@ -87,23 +94,29 @@ async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_token(req: RefreshRequest):
+async def refresh_token(req: RefreshRequest, db: AsyncSession = Depends(get_db)):
     try:
-        payload = jwt.decode(
-            req.refresh_token,
-            settings.SECRET_KEY,
-            algorithms=["HS256"]
-        )
-        user_id = payload.get("sub")
-
-    except Exception:
-        raise HTTPException(status_code=401, detail="Invalid refresh token")
+        user_id, new_refresh = await rotate_refresh_token(db, req.refresh_token)
+    except InvalidRefreshToken as e:
+        raise HTTPException(status_code=401, detail=str(e))
 
-    new_access = create_access_token({"sub": user_id})
-    new_refresh = create_refresh_token({"sub": user_id})
+    # Same claims as login, so AUTH_TOKEN_CLAIMS keeps working after the first refresh
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+    if user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+    new_access = create_access_token({"sub": str(user_id), "active": user.is_active is not False})
 
     return TokenResponse(
         access_token=new_access,
         refresh_token=new_refresh,
         token_type="bearer"
     )
+
+
+@router.post("/logout")
+async def logout(req: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    try:
+        await revoke_refresh_token(db, req.refresh_token)
+    except InvalidRefreshToken:
+        pass   # already unusable; logout is idempotent
+    return {"message": "Logged out"}
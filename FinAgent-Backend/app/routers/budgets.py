@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.schemas.budget import BudgetCreate, BudgetOut
-from app.core.database import get_db
+from sqlalchemy.exc import IntegrityError
+from app.schemas.budget import BudgetCreate, BudgetOut, BudgetStatus
+from app.core.database import get_db, get_read_db
 from app.models.budget import Budget
-from app.core.auth_bearer import get_current_user
+from app.core.auth_bearer import get_current_principal
+from app.core.cache import cache, BUDGETS
+from app.services.budget_service import list_budgets, budget_status, upsert_budgets
 
 router = APIRouter(prefix="/budgets", tags=["budgets"])
 
@@ -12,24 +15,50 @@ router = APIRouter(prefix="/budgets", tags=["budgets"])
 async def add_budget(
     data: BudgetCreate,
     db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_principal)
 ):
     new_budget = Budget(user_id=current_user.id, **data.dict())
     db.add(new_budget)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(409, "Budget with this category and period already exists")
+    await cache.invalidate(BUDGETS, current_user.id)
     await db.refresh(new_budget)
     return new_budget
 
 
 @router.get("/", response_model=list[BudgetOut])
 async def get_budgets(
-    db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_principal)
 ):
-    result = await db.execute(
-        select(Budget).where(Budget.user_id == current_user.id)
+    return await cache.get_or_load(
+        BUDGETS, current_user.id, "list",
+        lambda: list_budgets(db, current_user.id),
     )
-    return result.scalars().all()
+
+
+@router.put("/", response_model=list[BudgetOut])
+async def put_budgets(
+    data: list[BudgetCreate],
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_principal)
+):
+    """ Create or update a whole set of budgets (keyed on category and period) in one statement """
+    rows = await upsert_budgets(db, current_user.id, data)
+    await db.commit()
+    await cache.invalidate(BUDGETS, current_user.id)
+    return rows
+
+
+@router.get("/status", response_model=list[BudgetStatus])
+async def get_budget_status(
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_principal)
+):
+    return await budget_status(db, current_user.id)
 
 
 @router.put("/{budget_id}", response_model=BudgetOut)
@@ -37,16 +66,21 @@ async def update_budget(
     budget_id: int,
     data: BudgetCreate,
     db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_principal)
 ):
-    result = await db.execute(
-        Budget.__table__.update()
-        .where(Budget.id == budget_id, Budget.user_id == current_user.id)
-        .values(**data.dict())
-        .returning(Budget)
-    )
-    updated = result.fetchone()
-    await db.commit()
+    try:
+        result = await db.execute(
+            Budget.__table__.update()
+            .where(Budget.id == budget_id, Budget.user_id == current_user.id)
+            .values(**data.dict())
+            .returning(Budget)
+        )
+        updated = result.fetchone()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(409, "Budget with this category and period already exists")
+    await cache.invalidate(BUDGETS, current_user.id)
 
     if not updated:
         raise HTTPException(404, "Budget not found")
@@ -58,7 +92,7 @@ async def update_budget(
 async def delete_budget(
     budget_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_principal)
 ):
     await db.execute(
         Budget.__table__.delete().where(
@@ -67,4 +101,5 @@ async def delete_budget(
         )
     )
     await db.commit()
+    await cache.invalidate(BUDGETS, current_user.id)
     return {"message": "Budget deleted"}
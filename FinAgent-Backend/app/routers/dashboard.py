@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+
+from app.core.auth_bearer import get_current_user
+from app.core.database import read_sessionmaker
+from app.models.user import User
+from app.schemas.dashboard import DashboardOut
+from app.schemas.user import UserOut
+from app.services.dashboard_service import load_dashboard
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+# One authenticated round trip for the home screen instead of five
+@router.get("/", response_model=DashboardOut)
+async def get_dashboard(
+    session_factory=Depends(read_sessionmaker),
+    current_user: User = Depends(get_current_user)
+):
+    data = await load_dashboard(session_factory, current_user.id)
+    return {"user": UserOut.model_validate(current_user), **data}
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.schemas.goal import GoalCreate, GoalOut
-from app.core.database import get_db
+from app.schemas.goal import GoalCreate, GoalUpsert, GoalOut, GoalProjectionOut
+from app.core.database import get_db, get_read_db
 from app.models.goal import Goal
-from app.core.auth_bearer import get_current_user
+from app.core.auth_bearer import get_current_principal
+from app.core.cache import cache, GOALS
+from app.services.goal_service import list_goals, upsert_goals
+from app.services.goal_forecast import user_projections, forget_projections
 
 router = APIRouter(prefix="/goals", tags=["goals"])
 
@@ -12,24 +15,47 @@ router = APIRouter(prefix="/goals", tags=["goals"])
 async def add_goal(
     data: GoalCreate,
     db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_principal)
 ):
     goal = Goal(user_id=current_user.id, **data.dict())
     db.add(goal)
     await db.commit()
+    await cache.invalidate(GOALS, current_user.id)
     await db.refresh(goal)
     return goal
 
 
 @router.get("/", response_model=list[GoalOut])
 async def get_goals(
-    db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_principal)
 ):
-    result = await db.execute(
-        select(Goal).where(Goal.user_id == current_user.id)
+    return await cache.get_or_load(
+        GOALS, current_user.id, "list",
+        lambda: list_goals(db, current_user.id),
     )
-    return result.scalars().all()
+
+
+@router.put("/", response_model=list[GoalOut])
+async def put_goals(
+    data: list[GoalUpsert],
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_principal)
+):
+    """ Create (no id) or update (id; only the fields sent) a whole set of goals at once """
+    rows = await upsert_goals(db, current_user.id, data)
+    await forget_projections(db, [g.id for g in rows])
+    await db.commit()
+    await cache.invalidate(GOALS, current_user.id)
+    return rows
+
+
+@router.get("/projections", response_model=list[GoalProjectionOut])
+async def get_goal_projections(
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_principal)
+):
+    return await user_projections(db, current_user.id)
 
 
 @router.put("/{goal_id}", response_model=GoalOut)
@@ -37,7 +63,7 @@ async def update_goal(
     goal_id: int,
     data: GoalCreate,
     db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_principal)
 ):
     result = await db.execute(
         Goal.__table__.update()
@@ -46,7 +72,10 @@ async def update_goal(
         .returning(Goal)
     )
     updated = result.fetchone()
+    if updated:
+        await forget_projections(db, [goal_id])
     await db.commit()
+    await cache.invalidate(GOALS, current_user.id)
 
     if not updated:
         raise HTTPException(404, "Goal not found")
@@ -58,7 +87,7 @@ async def update_goal(
 async def delete_goal(
     goal_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_principal)
 ):
     await db.execute(
         Goal.__table__.delete().where(
@@ -67,4 +96,5 @@ async def delete_goal(
         )
     )
     await db.commit()
+    await cache.invalidate(GOALS, current_user.id)
     return {"message": "Goal deleted"}
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Request, Response
+
+from app.core.database import ping_databases
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+# Liveness: the process is up and the event loop is responsive
+@router.get("/live")
+async def live():
+    return {"status": "alive"}
+
+
+# Readiness: every configured database answers through its pool right now
+@router.get("/ready")
+async def ready(request: Request, response: Response):
+    databases = await ping_databases()
+    if not all(databases.values()):
+        response.status_code = 503
+        return {"status": "unavailable", "databases": databases}
+    return {
+        "status": "ready",
+        "databases": databases,
+        "startup": getattr(request.app.state, "startup_timings", {}),
+    }
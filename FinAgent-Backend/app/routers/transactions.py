@@ -1,36 +1,192 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+import os
+import shutil
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File
+from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.core.database import get_db
-from app.core.auth_bearer import get_current_user
-
-from app.schemas.transaction import TransactionCreate, TransactionOut, TransactionUpdate
+from sqlalchemy import select
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.auth_bearer import get_current_principal
+from app.core.cache import cache, TRANSACTIONS
+from app.models.import_job import ImportJob
+from app.schemas.import_job import ImportJobOut
+from app.services.statement_parser import SUPPORTED_SUFFIXES
+from workers.celery_app import celery_app
+
+from app.schemas.transaction import (
+    TransactionCreate, TransactionOut, TransactionUpdate, TransactionFilter,
+    TransactionBulkIds, TransactionBulkUpdate,
+    BulkRowError, BulkTransactionResult
+)
 from app.services.transaction_service import (
-    create_transaction, list_transactions, get_transaction,
-    update_transaction, delete_transaction,
-    monthly_summary, category_summary
+    create_transaction, bulk_create_transactions, list_transactions,
+    update_transaction, update_transactions, delete_transaction, delete_transactions,
+    monthly_summary, category_summary, timeframe_summary,
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, TRANSACTION_TYPES, GRANULARITIES
 )
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
+logger = logging.getLogger(__name__)
 
 
 @router.post("/", response_model=TransactionOut)
 async def add_transaction(
     payload: TransactionCreate,
     db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_principal)
 ):
     user_id = current_user.id     # ✅ FIXED
     return await create_transaction(db, user_id, payload)
 
 
+@router.post("/bulk", response_model=BulkTransactionResult)
+async def add_transactions_bulk(
+    payload: list[dict],
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_principal)
+):
+    # Validate row by row so one bad line doesn't reject the whole statement
+    valid, errors = [], []
+    for index, raw in enumerate(payload):
+        try:
+            item = TransactionCreate(**raw)
+        except ValidationError as e:
+            errors.append(BulkRowError(index=index, error=str(e)))
+            continue
+        if item.type not in TRANSACTION_TYPES:
+            errors.append(BulkRowError(index=index, error=f"type must be one of {TRANSACTION_TYPES}"))
+            continue
+        valid.append(item)
+
+    inserted = await bulk_create_transactions(db, current_user.id, valid) if valid else []
+    return {"inserted": inserted, "errors": errors}
+
+
+@router.post("/import", response_model=ImportJobOut, status_code=202)
+async def import_statement(
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_principal)
+):
+    filename = file.filename or ""
+    suffix = os.path.splitext(filename)[1].lower()
+    if suffix not in SUPPORTED_SUFFIXES:
+        raise HTTPException(status_code=400, detail=f"Unsupported file type; expected one of {SUPPORTED_SUFFIXES}")
+
+    # Spool to disk in the threadpool; the worker streams it from there
+    os.makedirs(settings.IMPORT_UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(settings.IMPORT_UPLOAD_DIR, f"{uuid.uuid4().hex}{suffix}")
+
+    def _spool():
+        with open(path, "wb") as out:
+            shutil.copyfileobj(file.file, out, length=1024 * 1024)
+
+    await run_in_threadpool(_spool)
+
+    job = ImportJob(user_id=current_user.id, filename=filename, status="queued")
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+
+    try:
+        celery_app.send_task(
+            "workers.tasks.csv_tasks.import_statement",
+            args=[job.id, current_user.id, path],
+        )
+    except Exception:
+        # Broker unreachable: no worker will ever pick this job (or its file) up
+        logger.warning("could not enqueue import job %s", job.id, exc_info=True)
+        job.status = "failed"
+        job.error = "could not be queued"
+        await db.commit()
+        await run_in_threadpool(os.remove, path)
+        raise HTTPException(status_code=503, detail="Imports are unavailable right now; please try again later")
+
+    return job
+
+
+@router.get("/import/{job_id}", response_model=ImportJobOut)
+async def import_status(
+    job_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_principal)
+):
+    result = await db.execute(
+        select(ImportJob).where(ImportJob.id == job_id, ImportJob.user_id == current_user.id)
+    )
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
 @router.get("/", response_model=list[TransactionOut])
 async def get_all_transactions(
-    db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    date_from: datetime | None = Query(None),
+    date_to: datetime | None = Query(None),
+    category: list[str] | None = Query(None),
+    merchant: str | None = Query(None, description="case-insensitive merchant prefix"),
+    type: str | None = Query(None, pattern="^(debit|credit)$"),
+    min_amount: float | None = Query(None),
+    max_amount: float | None = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_principal)
 ):
     user_id = current_user.id     # ✅ FIXED
-    return await list_transactions(db, user_id)
+    filters = TransactionFilter(
+        date_from=date_from,
+        date_to=date_to,
+        categories=category,
+        merchant_prefix=merchant,
+        type=type,
+        min_amount=min_amount,
+        max_amount=max_amount,
+    )
+    # Without ?limit= or ?cursor= the whole history comes back as before
+    # (the shipped mobile client reads a single GET); paging is opt-in
+    if limit is None and cursor is not None:
+        limit = DEFAULT_PAGE_SIZE
+    try:
+        rows, next_cursor = await list_transactions(db, user_id, limit, cursor, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Body stays a plain list; pass this back as ?cursor= to get the next page
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    return rows
+
+
+# Bulk routes are declared before /{tx_id} so "bulk" isn't parsed as an id
+@router.patch("/bulk", response_model=list[TransactionOut])
+async def edit_transactions_bulk(
+    payload: TransactionBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_principal)
+):
+    return await update_transactions(
+        db, current_user.id, payload.ids, payload.changes.dict(exclude_unset=True)
+    )
+
+
+@router.delete("/bulk")
+async def remove_transactions_bulk(
+    payload: TransactionBulkIds,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_principal)
+):
+    deleted = await delete_transactions(db, current_user.id, payload.ids)
+    return {"deleted": len(deleted), "ids": deleted}
 
 
 @router.patch("/{tx_id}", response_model=TransactionOut)
@@ -38,40 +194,59 @@ async def edit_transaction(
     tx_id: int,
     payload: TransactionUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_principal)
 ):
-    tx = await get_transaction(db, tx_id)
-    if not tx or tx.user_id != current_user.id:   # ✅ FIXED
+    # Ownership is part of the UPDATE's WHERE clause
+    tx = await update_transaction(db, current_user.id, tx_id, payload.dict(exclude_unset=True))
+    if not tx:
         raise HTTPException(status_code=404, detail="Transaction not found")
-
-    return await update_transaction(db, tx, payload.dict(exclude_unset=True))
+    return tx
 
 
 @router.delete("/{tx_id}")
 async def remove_transaction(
     tx_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_principal)
 ):
-    tx = await get_transaction(db, tx_id)
-    if not tx or tx.user_id != current_user.id:   # ✅ FIXED
+    if not await delete_transaction(db, current_user.id, tx_id):
         raise HTTPException(status_code=404, detail="Transaction not found")
-
-    await delete_transaction(db, tx)
     return {"deleted": True}
 
 
+@router.get("/summary")
+async def summary(
+    granularity: str = Query("month", pattern="^(" + "|".join(GRANULARITIES) + ")$"),
+    date_from: datetime | None = Query(None),
+    date_to: datetime | None = Query(None),
+    category: str | None = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_principal)
+):
+    name = f"summary:{granularity}:{date_from}:{date_to}:{category}"
+    return await cache.get_or_load(
+        TRANSACTIONS, current_user.id, name,
+        lambda: timeframe_summary(db, current_user.id, granularity, date_from, date_to, category),
+    )
+
+
 @router.get("/summary/monthly")
 async def monthly(
-    db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_principal)
 ):
-    return await monthly_summary(db, current_user.id)   # ✅ FIXED
+    return await cache.get_or_load(
+        TRANSACTIONS, current_user.id, "summary:monthly",
+        lambda: monthly_summary(db, current_user.id),
+    )
 
 
 @router.get("/summary/categories")
 async def categories(
-    db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_principal)
 ):
-    return await category_summary(db, current_user.id)  # ✅ FIXED
+    return await cache.get_or_load(
+        TRANSACTIONS, current_user.id, "summary:categories",
+        lambda: category_summary(db, current_user.id),
+    )
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from app.core.database import get_db
 from app.core.auth_bearer import get_current_user
+from app.core.cache import cache, USERS
 from app.models.user import User
 from app.schemas.user import UserOut
 
@@ -17,6 +18,7 @@ async def update_me(payload: dict, db: AsyncSession = Depends(get_db), current_u
     stmt = update(User).where(User.id == current_user.id).values(**payload).execution_options(synchronize_session="fetch")
     await db.execute(stmt)
     await db.commit()
+    await cache.invalidate(USERS, current_user.id)
     q = await db.execute(select(User).where(User.id == current_user.id))
     user = q.scalar_one()
     return user
@@ -1,14 +1,38 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
+from typing import Literal, Optional
+from datetime import datetime
+
+# The periods GET /budgets/status knows how to window; anything else is a 422
+BudgetPeriod = Literal["weekly", "monthly", "yearly"]
 
 class BudgetBase(BaseModel):
     category: str
     amount: float
-    
+    period: Optional[BudgetPeriod] = "monthly"
+
+    @field_validator("period")
+    @classmethod
+    def default_period(cls, v):
+        # period is part of the (user_id, category, period) key, so never store NULL
+        return v or "monthly"
 
 class BudgetCreate(BudgetBase):
     pass
 
 class BudgetOut(BudgetBase):
     id: int
+    period: str  # rows saved before the check may hold other values
     class Config:
         from_attributes = True
+
+class BudgetStatus(BaseModel):
+    id: int
+    category: str
+    amount: float
+    period: str
+    period_start: datetime
+    period_end: datetime
+    spent: float
+    remaining: float
+    percent_used: float
+    monthly_equivalent: float  # budget amount scaled to a month, for comparing periods
@@ -1,7 +1,29 @@
 from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
 
 class MessageCreate(BaseModel):
     message: str
 
 class AdvisorReply(BaseModel):
     reply: str
+
+class MessageOut(BaseModel):
+    id: int
+    sender: str
+    message: str
+    created_at: datetime
+    class Config:
+        from_attributes = True
+
+class AdvisorJobOut(BaseModel):
+    id: int
+    status: str  # queued | running | done | failed
+    message_id: int
+    reply: Optional[MessageOut] = None   # set once status is done
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
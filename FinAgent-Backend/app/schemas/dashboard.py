@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from app.schemas.user import UserOut
+from app.schemas.budget import BudgetOut
+from app.schemas.goal import GoalOut
+
+class DashboardOut(BaseModel):
+    user: UserOut
+    monthly_summary: list[dict]
+    category_summary: list[dict]
+    budgets: list[BudgetOut]
+    goals: list[GoalOut]
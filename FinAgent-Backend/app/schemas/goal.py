@@ -10,7 +10,17 @@ class GoalBase(BaseModel):
 class GoalCreate(GoalBase):
     pass
 
+class GoalUpsert(GoalBase):
+    id: int | None = None  # set: update that goal; omitted: create a new one
+
 class GoalOut(GoalBase):
     id: int
     class Config:
         from_attributes = True
+
+class GoalProjectionOut(BaseModel):
+    goal_id: int
+    monthly_savings_mean: float
+    monthly_savings_std: float
+    projected_completion: date | None = None
+    on_track_probability: float | None = None  # None when the goal has no deadline
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class ImportJobOut(BaseModel):
+    id: int
+    filename: str
+    status: str  # queued | running | done | failed
+    rows_processed: int
+    rows_inserted: int
+    rows_skipped: int
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
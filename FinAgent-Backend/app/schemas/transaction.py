@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
@@ -19,9 +19,33 @@ class TransactionUpdate(BaseModel):
     category: Optional[str] = None
     date: Optional[datetime] = None
 
+class TransactionBulkIds(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=1000)
+
+class TransactionBulkUpdate(TransactionBulkIds):
+    changes: TransactionUpdate
+
+class TransactionFilter(BaseModel):
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    categories: Optional[list[str]] = None
+    merchant_prefix: Optional[str] = None
+    type: Optional[str] = None  # debit / credit
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+
 class TransactionOut(TransactionBase):
     id: int
     user_id: int
 
     class Config:
         orm_mode = True
+
+
+class BulkRowError(BaseModel):
+    index: int  # position in the submitted list
+    error: str
+
+class BulkTransactionResult(BaseModel):
+    inserted: list[TransactionOut]
+    errors: list[BulkRowError]
@@ -0,0 +1,240 @@
+"""
+Advisor data access and streaming answers.
+
+load_agent_inputs is the coaching agent's data layer (API worker, Celery
+advisor task and the CLI all use it): profile plus windowed transactions in
+one statement over the app's pooled engine.
+
+The CLI coach (app/langgraph/Financial_Coaching_Agent.py) runs the whole
+graph and then answers follow-ups with one blocking llm.invoke. Over HTTP
+the answer is streamed instead: the context is a spending summary computed
+in SQL plus the recent conversation, and the model's tokens are forwarded
+as Server-Sent Events as they arrive.
+"""
+import json
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.conversation import Conversation
+from app.models.user import User
+from app.services.conversation_service import list_messages
+
+ANALYSIS_DAYS = 30
+FALLBACK_DAYS = 365   # same retry as the CLI when the last month is empty
+
+_llm = None
+_agent = None
+
+
+def get_llm():
+    """ Shared chat model; the google client is only imported when first needed """
+    global _llm
+    if _llm is None:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        _llm = ChatGoogleGenerativeAI(
+            google_api_key=settings.GOOGLE_API_KEY,
+            model=settings.ADVISOR_MODEL,
+            temperature=0.7,
+        )
+    return _llm
+
+
+def get_agent():
+    """ One coaching agent per process, sharing the chat model above """
+    global _agent
+    if _agent is None:
+        from app.langgraph.Financial_Coaching_Agent import FinancialCoachAgent
+
+        _agent = FinancialCoachAgent(llm=get_llm())
+    return _agent
+
+
+# Picks the analysis window in SQL: ANALYSIS_DAYS if the user has any
+# transaction in it, else FALLBACK_DAYS. The EXISTS probe is one index
+# lookup on ix_transactions_user_id_date_id.
+_WINDOW_CTE = """
+WITH w AS (
+    SELECT CASE WHEN EXISTS (
+               SELECT 1 FROM transactions
+               WHERE user_id = :user_id
+                 AND date >= now() - make_interval(days => CAST(:days AS integer))
+           ) THEN CAST(:days AS integer)
+           ELSE CAST(:fallback_days AS integer) END AS days
+)
+"""
+
+SPENDING_SQL = text(_WINDOW_CTE + """
+SELECT w.days,
+       t.category,
+       COALESCE(SUM(t.amount) FILTER (WHERE t.type = 'debit'), 0) AS spent,
+       COALESCE(SUM(t.amount) FILTER (WHERE t.type = 'credit'), 0) AS income,
+       COUNT(t.id) AS n
+FROM w
+LEFT JOIN transactions t
+       ON t.user_id = :user_id
+      AND t.date >= now() - make_interval(days => w.days)
+GROUP BY w.days, t.category
+""")
+
+# Profile and windowed transactions together; a user without transactions
+# still gets one row (transaction columns NULL), an unknown user none.
+AGENT_INPUTS_SQL = text(_WINDOW_CTE + """
+SELECT u.name, u.occupation, u."monthlyIncome" AS monthly_income, w.days,
+       t.id, t.amount, t.type, t.category, t.merchant, t.date, t.source
+FROM users u
+CROSS JOIN w
+LEFT JOIN transactions t
+       ON t.user_id = u.id
+      AND t.date >= now() - make_interval(days => w.days)
+WHERE u.id = :user_id
+ORDER BY t.date DESC
+""")
+
+
+def _window_params(user_id: int, days: int, fallback_days: Optional[int]) -> dict:
+    return {"user_id": user_id, "days": days, "fallback_days": fallback_days or days}
+
+
+async def spending_analysis(
+    db: AsyncSession,
+    user_id: int,
+    days: int = ANALYSIS_DAYS,
+    fallback_days: Optional[int] = FALLBACK_DAYS,
+) -> dict:
+    """
+    The agent's spending_analysis (totals, savings rate, per-category
+    spend) as one GROUP BY instead of shipping every transaction to Python.
+    """
+    res = await db.execute(SPENDING_SQL, _window_params(user_id, days, fallback_days))
+    rows = res.all()
+    days = rows[0].days   # the LEFT JOIN from w always yields a row
+    rows = [r for r in rows if r.n]
+
+    total_spent = sum(float(r.spent) for r in rows)
+    total_income = sum(float(r.income) for r in rows)
+    category_totals = {(r.category or "Other"): float(r.spent) for r in rows if r.spent}
+    return {
+        "days": days,
+        "total_spent": total_spent,
+        "total_income": total_income,
+        "savings_rate": ((total_income - total_spent) / total_income * 100) if total_income > 0 else 0.0,
+        "category_totals": category_totals,
+        "category_percentages": {
+            cat: (amt / total_spent * 100) if total_spent > 0 else 0.0
+            for cat, amt in category_totals.items()
+        },
+        "transaction_count": sum(r.n for r in rows),
+    }
+
+
+# Transaction types as the coaching agent's analyze_spending expects them
+AGENT_TYPES = {"debit": "expense", "credit": "income"}
+
+
+async def load_agent_inputs(
+    db: AsyncSession,
+    user_id: int,
+    days: int = ANALYSIS_DAYS,
+    fallback_days: Optional[int] = FALLBACK_DAYS,
+) -> tuple[dict, list[dict]]:
+    """
+    (user_profile, transactions) for the coaching agent in one round trip:
+    the last `days` of transactions, or the last `fallback_days` when that
+    window is empty (None: no fallback).
+    """
+    rows = (await db.execute(AGENT_INPUTS_SQL, _window_params(user_id, days, fallback_days))).all()
+    if not rows:
+        return {"id": user_id, "name": "Unknown User", "type": "user"}, []
+
+    first = rows[0]
+    # Only what the prompts need; never credentials
+    profile = {
+        "id": user_id,
+        "name": first.name or "User",
+        "type": first.occupation or "user",
+        "monthlyIncome": first.monthly_income,
+        "window_days": first.days,
+    }
+    transactions = [
+        {
+            "id": r.id,
+            "amount": float(r.amount or 0.0),
+            "type": AGENT_TYPES.get(r.type, r.type),
+            "category": r.category or "Other",
+            "merchant": r.merchant,
+            "date": r.date.isoformat() if r.date else None,
+            "source": r.source,
+        }
+        for r in rows if r.id is not None
+    ]
+    return profile, transactions
+
+
+async def build_chat_prompt(db: AsyncSession, user_id: int, question: str) -> str:
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+    profile = {
+        "name": (user.name if user else None) or "User",
+        "type": (user.occupation if user else None) or "user",
+        "monthly_income": user.monthlyIncome if user else None,
+    }
+    analysis = await spending_analysis(db, user_id)
+    history, _, _ = await list_messages(db, user_id, settings.ADVISOR_HISTORY_MESSAGES)
+    transcript = "\n".join(f"{m.sender}: {m.message}" for m in history)
+
+    return f"""
+You are a supportive financial coach speaking directly to a {profile['type']}.
+
+USER PROFILE:
+{json.dumps(profile, indent=2)}
+
+SPENDING ANALYSIS (last {analysis['days']} days):
+{json.dumps(analysis, indent=2)}
+
+RECENT CONVERSATION:
+{transcript or "(none)"}
+
+Answer as the same friendly coach, in a clear, conversational way (3–6 sentences).
+Don't repeat all the numbers unless it's needed; focus on being helpful and practical.
+
+User's question: {question}
+"""
+
+
+def sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_reply(session_factory, user_id: int, prompt: str) -> AsyncIterator[str]:
+    """
+    Yield the answer as SSE `token` events, then store it as an advisor
+    Conversation row and finish with a `done` event carrying its id.
+
+    Runs after the request's own session is gone, so the final write uses
+    a fresh one from `session_factory`. A client that disconnects mid-way
+    cancels the generation and nothing is stored.
+    """
+    from langchain_core.messages import HumanMessage
+    from app.workers.ws import publish_message
+
+    parts: list[str] = []
+    try:
+        async for chunk in get_llm().astream([HumanMessage(content=prompt)]):
+            if chunk.content:
+                parts.append(chunk.content)
+                yield sse("token", {"text": chunk.content})
+    except Exception as e:
+        yield sse("error", {"detail": f"advisor failed: {type(e).__name__}"})
+        return
+
+    async with session_factory() as db:
+        reply = Conversation(user_id=user_id, sender="advisor", message="".join(parts))
+        db.add(reply)
+        await db.commit()
+        await db.refresh(reply)
+    await publish_message(reply)
+
+    yield sse("done", {"id": reply.id, "created_at": reply.created_at.isoformat()})
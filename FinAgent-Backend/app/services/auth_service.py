@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
 from jose import jwt
@@ -6,10 +8,27 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.config import settings
 
+def _argon2_options() -> dict:
+    options = {
+        "argon2__time_cost": settings.ARGON2_TIME_COST,
+        "argon2__memory_cost": settings.ARGON2_MEMORY_COST,
+        "argon2__parallelism": settings.ARGON2_PARALLELISM,
+    }
+    return {k: v for k, v in options.items() if v is not None}
+
+
 # Use Argon2 (strong & compatible)
 pwd_context = CryptContext(
     schemes=["argon2"],
-    deprecated="auto"
+    deprecated="auto",
+    **_argon2_options(),
+)
+
+# argon2 is deliberately slow and memory-hard; keep it off the event loop and
+# bound how many run at once
+_hash_pool = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="argon2",
 )
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 15
@@ -27,6 +46,17 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+async def hash_password_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, pwd_context.hash, password)
+
+
+async def verify_and_update_async(plain: str, hashed: str) -> tuple[bool, str | None]:
+    """ (valid, new_hash); new_hash is set when `hashed` used outdated parameters """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, pwd_context.verify_and_update, plain, hashed)
+
+
 # ---------------------------------------------------------
 # AUTHENTICATE USER
 # ---------------------------------------------------------
@@ -38,9 +68,15 @@ async def authenticate_user(session: AsyncSession, email: str, password: str):
         return None
 
     # Important: use user.hashed_password (correct DB column)
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await verify_and_update_async(password, user.hashed_password)
+    if not valid:
         return None
 
+    # Cost settings changed since this hash was made: upgrade it transparently
+    if new_hash:
+        user.hashed_password = new_hash
+        await session.commit()
+
     return user
 
 
@@ -0,0 +1,95 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models.budget import Budget
+from app.schemas.budget import BudgetCreate, BudgetOut
+
+
+async def list_budgets(db: AsyncSession, user_id: int) -> list[dict]:
+    """ The user's budgets as JSON-ready dicts (cacheable as-is) """
+    result = await db.execute(
+        select(Budget).where(Budget.user_id == user_id)
+    )
+    return [BudgetOut.model_validate(row).model_dump(mode="json") for row in result.scalars().all()]
+
+
+async def upsert_budgets(db: AsyncSession, user_id: int, budgets: list[BudgetCreate]) -> list[Budget]:
+    """
+    Insert or update a set of budgets keyed on (category, period) in one
+    INSERT ... ON CONFLICT DO UPDATE ... RETURNING. Later entries win when
+    the payload repeats a key. Caller commits.
+    """
+    rows = {}
+    for b in budgets:
+        rows[(b.category, b.period)] = {"user_id": user_id, **b.model_dump()}
+    if not rows:
+        return []
+
+    stmt = pg_insert(Budget).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_budgets_user_id_category_period",
+        set_={"amount": stmt.excluded.amount},
+    ).returning(Budget)
+    res = await db.execute(stmt)
+    return sorted(res.scalars().all(), key=lambda b: b.id)
+
+
+# Monthly-equivalent scaling for weekly/yearly budgets
+MONTHLY_FACTOR = {"weekly": 52 / 12, "monthly": 1.0, "yearly": 1 / 12}
+
+# Every budget joined to the debit total for its *current* period, in one
+# statement. The spend lookup is an index-only scan of
+# ix_transactions_debit_user_category_date.
+BUDGET_STATUS_SQL = text("""
+SELECT b.id,
+       b.category,
+       b.amount,
+       w.period,
+       w.period_start,
+       w.period_end,
+       COALESCE(s.spent, 0) AS spent
+FROM budgets b
+CROSS JOIN LATERAL (
+    SELECT p.period,
+           date_trunc(p.unit, now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS period_start,
+           (date_trunc(p.unit, now() AT TIME ZONE 'UTC') + ('1 ' || p.unit)::interval) AT TIME ZONE 'UTC' AS period_end
+    FROM (
+        SELECT COALESCE(b.period, 'monthly') AS period,
+               CASE b.period WHEN 'weekly' THEN 'week' WHEN 'yearly' THEN 'year' ELSE 'month' END AS unit
+    ) p
+) w
+LEFT JOIN LATERAL (
+    SELECT SUM(t.amount) AS spent
+    FROM transactions t
+    WHERE t.user_id = b.user_id
+      AND t.type = 'debit'
+      AND t.category = b.category
+      AND t.date >= w.period_start
+      AND t.date < w.period_end
+) s ON true
+WHERE b.user_id = :user_id
+ORDER BY b.id
+""")
+
+
+async def budget_status(db: AsyncSession, user_id: int) -> list[dict]:
+    """ Spent / remaining / percent used for each budget in its current period """
+    res = await db.execute(BUDGET_STATUS_SQL, {"user_id": user_id})
+
+    statuses = []
+    for r in res.all():
+        spent = float(r.spent)
+        amount = float(r.amount)
+        statuses.append({
+            "id": r.id,
+            "category": r.category,
+            "amount": amount,
+            "period": r.period,
+            "period_start": r.period_start,
+            "period_end": r.period_end,
+            "spent": spent,
+            "remaining": amount - spent,
+            "percent_used": (spent / amount * 100) if amount > 0 else 0.0,
+            "monthly_equivalent": amount * MONTHLY_FACTOR.get(r.period, 1.0),
+        })
+    return statuses
@@ -0,0 +1,73 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.conversation import Conversation
+
+DEFAULT_PAGE_SIZE = 30
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(msg: Conversation) -> str:
+    """ Opaque cursor pointing at `msg` in (created_at, id) order """
+    raw = json.dumps([msg.created_at.isoformat(), msg.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """ Inverse of encode_cursor; raises ValueError on anything malformed """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, msg_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(msg_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+async def list_messages(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = DEFAULT_PAGE_SIZE,
+    before: str | None = None,
+    after: str | None = None,
+):
+    """
+    One page of the user's conversation, oldest first, plus cursors for the
+    pages on either side: (rows, before_cursor, after_cursor).
+
+    With no cursor this is the latest page. `before` walks back into older
+    history; `after` fetches what arrived since (e.g. polling for new
+    messages). before_cursor is None once the start of the history is
+    reached; after_cursor always points at the newest message seen so the
+    client can keep polling. Both directions are range scans of
+    ix_conversations_user_id_created_at_id.
+    """
+    if before and after:
+        raise ValueError("Pass either before or after, not both")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    key = tuple_(Conversation.created_at, Conversation.id)
+
+    q = select(Conversation).where(Conversation.user_id == user_id).limit(limit + 1)
+    if after:
+        q = q.where(key > tuple_(*decode_cursor(after)))
+        q = q.order_by(Conversation.created_at.asc(), Conversation.id.asc())
+    else:
+        if before:
+            q = q.where(key < tuple_(*decode_cursor(before)))
+        q = q.order_by(Conversation.created_at.desc(), Conversation.id.desc())
+
+    rows = (await db.execute(q)).scalars().all()
+    has_more = len(rows) > limit   # one extra row tells us whether the page is full
+    rows = rows[:limit]
+    if not after:
+        rows.reverse()
+
+    if not rows:
+        return [], None, after
+
+    # Older rows exist past an `after` page by definition (the cursor row)
+    before_cursor = encode_cursor(rows[0]) if (after or has_more) else None
+    return rows, before_cursor, encode_cursor(rows[-1])
@@ -0,0 +1,37 @@
+import asyncio
+
+from app.core.cache import cache, TRANSACTIONS, BUDGETS, GOALS
+from app.services.transaction_service import monthly_summary, category_summary
+from app.services.budget_service import list_budgets
+from app.services.goal_service import list_goals
+
+
+async def _with_session(session_factory, loader, user_id: int):
+    # An AsyncSession can't run statements concurrently, so each part gets
+    # its own pooled connection
+    async with session_factory() as db:
+        return await loader(db, user_id)
+
+
+def _cached(session_factory, scope: str, name: str, loader, user_id: int):
+    # Same cache keys as the individual endpoints, so either warms the other
+    return cache.get_or_load(
+        scope, user_id, name,
+        lambda: _with_session(session_factory, loader, user_id),
+    )
+
+
+async def load_dashboard(session_factory, user_id: int) -> dict:
+    """ Everything the home screen needs, fetched concurrently """
+    monthly, categories, budgets, goals = await asyncio.gather(
+        _cached(session_factory, TRANSACTIONS, "summary:monthly", monthly_summary, user_id),
+        _cached(session_factory, TRANSACTIONS, "summary:categories", category_summary, user_id),
+        _cached(session_factory, BUDGETS, "list", list_budgets, user_id),
+        _cached(session_factory, GOALS, "list", list_goals, user_id),
+    )
+    return {
+        "monthly_summary": monthly,
+        "category_summary": categories,
+        "budgets": budgets,
+        "goals": goals,
+    }
@@ -0,0 +1,258 @@
+"""
+Goal completion forecasting.
+
+Each user's monthly net savings (credits - debits, from transaction_rollups)
+gives a mean and spread of what they put aside per month. Savings are shared
+across the user's open goals in proportion to what each still needs, and a
+normal approximation of the cumulative savings gives the chance of reaching
+the target by the deadline. All of it is array math over every goal at once,
+so the batch run over all users is a handful of NumPy passes per batch.
+
+The batch (nightly via Celery beat, or by hand) writes goal_projections:
+
+    python -m app.services.goal_forecast
+
+GET /goals/projections serves those rows. Goals the batch hasn't seen yet,
+or that were edited since (editing drops the stored row), are projected on
+the fly.
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select, case, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.goal import Goal
+from app.models.goal_projection import GoalProjection
+from app.models.transaction_rollup import TransactionRollup
+
+HISTORY_MONTHS = 24
+DAYS_PER_MONTH = 365.25 / 12
+USER_BATCH_SIZE = 1000
+# Completion dates further out than this are reported as None (not on course);
+# it also keeps today + timedelta well inside date.max for tiny savings
+MAX_HORIZON_MONTHS = 1200
+# goal_projections rows per upsert: 6 bind params each, under asyncpg's 32767
+PROJECTION_CHUNK_ROWS = 1000
+
+
+def _normal_cdf(z: np.ndarray) -> np.ndarray:
+    # Abramowitz & Stegun 7.1.26 erf approximation (|error| < 1.5e-7), vectorized
+    x = np.abs(z) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-x * x)
+    return 0.5 * (1.0 + np.sign(z) * erf)
+
+
+def savings_stats(savings: np.ndarray, first_month: np.ndarray):
+    """
+    Per-user mean and standard deviation of monthly net savings.
+
+    `savings` is (users, months), oldest month first; months before a user's
+    `first_month` index (their first activity) are ignored, later empty
+    months count as zero.
+    """
+    months = np.arange(savings.shape[1])
+    mask = months[None, :] >= first_month[:, None]
+    n = np.maximum(mask.sum(axis=1), 1)
+    mean = (savings * mask).sum(axis=1) / n
+    var = (((savings - mean[:, None]) * mask) ** 2).sum(axis=1) / n
+    return mean, np.sqrt(var)
+
+
+def project_goals(
+    mean: np.ndarray,
+    std: np.ndarray,
+    goal_user: np.ndarray,
+    target: np.ndarray,
+    saved: np.ndarray,
+    months_to_deadline: np.ndarray,
+):
+    """
+    Vectorized projection for a flat array of goals.
+
+    goal_user maps each goal to its row in mean/std; months_to_deadline is
+    NaN for goals without a deadline. Returns (months_needed, probability),
+    with inf months when savings don't grow and NaN probability when there
+    is no deadline.
+    """
+    remaining = np.maximum(target - saved, 0.0)
+
+    # Split each user's savings across their goals by what each still needs
+    user_remaining = np.bincount(goal_user, weights=remaining, minlength=len(mean))
+    share = np.divide(
+        remaining, user_remaining[goal_user],
+        out=np.zeros_like(remaining), where=user_remaining[goal_user] > 0,
+    )
+    mu = mean[goal_user] * share
+    sigma = std[goal_user] * share
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        months_needed = np.where(
+            remaining <= 0, 0.0,
+            np.where(mu > 0, remaining / mu, np.inf),
+        )
+
+        n = np.maximum(months_to_deadline, 0.0)
+        expected = n * mu
+        spread = np.sqrt(n) * sigma
+        z = (expected - remaining) / spread
+        probability = np.where(spread > 0, _normal_cdf(z), (expected >= remaining).astype(float))
+
+    probability = np.where(remaining <= 0, 1.0, probability)
+    probability = np.where(np.isnan(months_to_deadline), np.nan, probability)
+    return months_needed, probability
+
+
+def _month_index(month: datetime, start: datetime) -> int:
+    month = month.astimezone(timezone.utc)
+    return (month.year - start.year) * 12 + (month.month - start.month)
+
+
+async def _load_savings(db: AsyncSession, user_ids: list[int], start: datetime, end: datetime):
+    """ (users, HISTORY_MONTHS) savings matrix and first-activity index per user """
+    net = func.sum(case((TransactionRollup.type == "credit", TransactionRollup.total), else_=-TransactionRollup.total))
+    res = await db.execute(
+        select(TransactionRollup.user_id, TransactionRollup.month, net.label("net"))
+        .where(
+            TransactionRollup.user_id.in_(user_ids),
+            TransactionRollup.month >= start,
+            TransactionRollup.month < end,
+        )
+        .group_by(TransactionRollup.user_id, TransactionRollup.month)
+    )
+    row_of = {uid: i for i, uid in enumerate(user_ids)}
+    savings = np.zeros((len(user_ids), HISTORY_MONTHS))
+    first = np.full(len(user_ids), HISTORY_MONTHS)
+    for r in res.all():
+        i = row_of[r.user_id]
+        m = _month_index(r.month, start)
+        savings[i, m] = r.net
+        first[i] = min(first[i], m)
+    return savings, first
+
+
+def _history_window(today: date):
+    # Completed months only; the current month is still filling up
+    end = datetime(today.year, today.month, 1, tzinfo=timezone.utc)
+    months_back = end.year * 12 + end.month - 1 - HISTORY_MONTHS
+    start = datetime(months_back // 12, months_back % 12 + 1, 1, tzinfo=timezone.utc)
+    return start, end
+
+
+async def forecast_goals(db: AsyncSession, goals: list, today: Optional[date] = None) -> list[dict]:
+    """ Projections for the given Goal rows (any mix of users) """
+    if not goals:
+        return []
+    today = today or date.today()
+    start, end = _history_window(today)
+
+    user_ids = sorted({g.user_id for g in goals})
+    savings, first = await _load_savings(db, user_ids, start, end)
+    mean, std = savings_stats(savings, first)
+
+    row_of = {uid: i for i, uid in enumerate(user_ids)}
+    goal_user = np.array([row_of[g.user_id] for g in goals])
+    target = np.array([g.target_amount for g in goals], dtype=float)
+    saved = np.array([g.saved_amount or 0.0 for g in goals], dtype=float)
+    to_deadline = np.array(
+        [(g.deadline - today).days / DAYS_PER_MONTH if g.deadline else np.nan for g in goals]
+    )
+
+    months_needed, probability = project_goals(mean, std, goal_user, target, saved, to_deadline)
+
+    out = []
+    for i, g in enumerate(goals):
+        reachable = months_needed[i] <= MAX_HORIZON_MONTHS   # False for inf too
+        out.append({
+            "goal_id": g.id,
+            "user_id": g.user_id,
+            "monthly_savings_mean": float(mean[goal_user[i]]),
+            "monthly_savings_std": float(std[goal_user[i]]),
+            "projected_completion": (today + timedelta(days=float(months_needed[i]) * DAYS_PER_MONTH)) if reachable else None,
+            "on_track_probability": None if np.isnan(probability[i]) else float(probability[i]),
+        })
+    return out
+
+
+PROJECTION_FIELDS = (
+    "goal_id", "user_id", "monthly_savings_mean", "monthly_savings_std",
+    "projected_completion", "on_track_probability",
+)
+
+
+async def user_projections(db: AsyncSession, user_id: int) -> list[dict]:
+    """
+    The user's goal projections, in goal id order: stored rows from
+    goal_projections, plus live projections for goals without one. Read-only,
+    so it can run on the replica.
+    """
+    goals = (await db.execute(select(Goal).where(Goal.user_id == user_id).order_by(Goal.id))).scalars().all()
+    res = await db.execute(select(GoalProjection).where(GoalProjection.user_id == user_id))
+    stored = {
+        p.goal_id: {f: getattr(p, f) for f in PROJECTION_FIELDS}
+        for p in res.scalars().all()
+    }
+    live = await forecast_goals(db, [g for g in goals if g.id not in stored])
+    by_goal = stored | {p["goal_id"]: p for p in live}
+    return [by_goal[g.id] for g in goals]
+
+
+async def forget_projections(db: AsyncSession, goal_ids: list[int]) -> None:
+    """ Drop stored projections for edited goals (caller commits); reads go live until the next batch """
+    if goal_ids:
+        await db.execute(delete(GoalProjection).where(GoalProjection.goal_id.in_(goal_ids)))
+
+
+async def _store_projections(db: AsyncSession, rows: list[dict]) -> None:
+    for start in range(0, len(rows), PROJECTION_CHUNK_ROWS):
+        chunk = rows[start:start + PROJECTION_CHUNK_ROWS]
+        stmt = pg_insert(GoalProjection).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["goal_id"],
+            set_={c: stmt.excluded[c] for c in PROJECTION_FIELDS if c != "goal_id"} | {"computed_at": func.now()},
+        )
+        await db.execute(stmt)
+
+
+async def precompute_all(db: AsyncSession) -> int:
+    """ Walk every user with goals in keyset batches and upsert goal_projections """
+    written = 0
+    last_user = 0
+    while True:
+        res = await db.execute(
+            select(Goal.user_id).distinct()
+            .where(Goal.user_id > last_user)
+            .order_by(Goal.user_id)
+            .limit(USER_BATCH_SIZE)
+        )
+        user_ids = res.scalars().all()
+        if not user_ids:
+            return written
+
+        goals = (await db.execute(select(Goal).where(Goal.user_id.in_(user_ids)))).scalars().all()
+        rows = await forecast_goals(db, goals)
+        if rows:
+            await _store_projections(db, rows)
+            await db.commit()
+        written += len(rows)
+        last_user = user_ids[-1]
+
+
+if __name__ == "__main__":
+    import asyncio
+    import time
+
+    from app.core.database import AsyncSessionLocal, engine
+
+    async def main():
+        t0 = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            written = await precompute_all(db)
+        await engine.dispose()
+        print(f"projected {written} goals in {time.perf_counter() - t0:.1f}s")
+
+    asyncio.run(main())
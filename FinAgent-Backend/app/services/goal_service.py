@@ -0,0 +1,68 @@
+from itertools import groupby
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, values, column, cast, Integer, String, Float, Date
+from app.models.goal import Goal
+from app.schemas.goal import GoalOut, GoalUpsert
+
+# Column types for the VALUES list bulk updates join against
+GOAL_FIELD_TYPES = {"title": String, "target_amount": Float, "saved_amount": Float, "deadline": Date}
+
+
+async def list_goals(db: AsyncSession, user_id: int) -> list[dict]:
+    """ The user's goals as JSON-ready dicts (cacheable as-is) """
+    result = await db.execute(
+        select(Goal).where(Goal.user_id == user_id)
+    )
+    return [GoalOut.model_validate(row).model_dump(mode="json") for row in result.scalars().all()]
+
+
+def _changes(goal: GoalUpsert) -> dict:
+    # Only what the client sent; a missing or null saved_amount keeps the stored one
+    changes = goal.model_dump(exclude_unset=True, exclude={"id"})
+    if changes.get("saved_amount", 0) is None:
+        del changes["saved_amount"]
+    return changes
+
+
+async def upsert_goals(db: AsyncSession, user_id: int, goals: list[GoalUpsert]) -> list[Goal]:
+    """
+    Apply a set of goals: entries without an id are created with one
+    multi-row INSERT ... RETURNING; entries with an id update that goal
+    through UPDATE ... FROM (VALUES ...) RETURNING, one statement per set of
+    sent fields (usually one). Ids the user doesn't own are skipped; a
+    repeated id keeps its last entry. Caller commits.
+    """
+    new = [{"user_id": user_id, **g.model_dump(exclude={"id"})} for g in goals if g.id is None]
+    edits = {g.id: _changes(g) for g in goals if g.id is not None}
+
+    out = []
+    if new:
+        res = await db.execute(insert(Goal).values(new).returning(Goal))
+        out.extend(res.scalars().all())
+
+    by_fields = lambda item: tuple(sorted(item[1]))
+    for fields, group in groupby(sorted(edits.items(), key=by_fields), key=by_fields):
+        if not fields:
+            continue
+        rows = [(goal_id, *(changes[f] for f in fields)) for goal_id, changes in group]
+        v = values(
+            column("id", Integer), *(column(f, GOAL_FIELD_TYPES[f]) for f in fields), name="v"
+        ).data(rows)
+        res = await db.execute(
+            update(Goal)
+            .where(Goal.id == v.c.id, Goal.user_id == user_id)
+            # cast: an all-NULL VALUES column (deadline cleared) would otherwise be text
+            .values({f: cast(v.c[f], GOAL_FIELD_TYPES[f]) for f in fields})
+            .returning(Goal)
+            .execution_options(synchronize_session=False)
+        )
+        out.extend(res.scalars().all())
+
+    # ids sent without any field to change still come back as they are
+    unchanged = [goal_id for goal_id, changes in edits.items() if not changes]
+    if unchanged:
+        res = await db.execute(select(Goal).where(Goal.id.in_(unchanged), Goal.user_id == user_id))
+        out.extend(res.scalars().all())
+
+    return sorted(out, key=lambda g: g.id)
@@ -0,0 +1,263 @@
+"""
+Fleet-wide proactive nudger.
+
+Walks every active user in keyset batches of NUDGER_BATCH_SIZE. A user is
+only processed when their newest transaction id is above the watermark in
+nudge_watermarks, i.e. something happened since the last pass; everyone
+else costs one row of the scan. Changed users are fed through a bounded
+queue to NUDGER_CONCURRENCY workers, each with its own pooled session and
+a NUDGER_USER_TIMEOUT_SECONDS budget for the analysis, so one slow user
+never stalls the batch. Alerts come from the agent's rule engine over a
+SQL spending summary (or, with NUDGER_USE_LLM, the full coaching pipeline)
+and are delivered as advisor messages in the same transaction as the
+user's watermark, so a user is never nudged twice for the same activity.
+Users without alerts get their watermarks upserted in batches. Users that
+fail or time out get none and are retried on the next pass.
+
+    python -m app.services.nudger
+
+Returns/prints throughput (users/min) and per-stage timings.
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.langgraph.Financial_Coaching_Agent import FinancialCoachAgent
+from app.models.conversation import Conversation
+from app.models.nudge_watermark import NudgeWatermark
+from app.models.transactions import Transaction
+from app.models.user import User
+from app.services.advisor_service import spending_analysis, load_agent_inputs, get_agent
+from app.workers.ws import publish_message
+
+logger = logging.getLogger(__name__)
+
+
+class NudgeStats:
+    """ Counters plus wall-clock totals per stage for one pass """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.scanned = 0
+        self.skipped = 0
+        self.nudged = 0
+        self.alerts = 0
+        self.timeouts = 0
+        self.failures = 0
+        self._stages = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            s = self._stages[name]
+            s["count"] += 1
+            s["total_ms"] += ms
+            s["max_ms"] = max(s["max_ms"], ms)
+
+    def as_dict(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        per_min = 60 / elapsed if elapsed > 0 else 0.0
+        return {
+            "elapsed_s": round(elapsed, 1),
+            "users_scanned": self.scanned,
+            "users_skipped": self.skipped,
+            "users_nudged": self.nudged,
+            "alerts": self.alerts,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "scanned_per_min": round(self.scanned * per_min, 1),
+            "nudged_per_min": round(self.nudged * per_min, 1),
+            "stages": {
+                name: {
+                    "count": s["count"],
+                    "avg_ms": round(s["total_ms"] / s["count"], 2) if s["count"] else 0.0,
+                    "max_ms": round(s["max_ms"], 2),
+                    "total_ms": round(s["total_ms"], 1),
+                }
+                for name, s in self._stages.items()
+            },
+        }
+
+
+def _scan_query(after_user: int, limit: int):
+    # Newest transaction per user next to their watermark; max(id) per user
+    # is one backward probe of ix_transactions_user_id_id
+    latest_tx = (
+        select(func.max(Transaction.id))
+        .where(Transaction.user_id == User.id)
+        .scalar_subquery()
+    )
+    return (
+        select(User.id, latest_tx.label("latest_tx"), NudgeWatermark.last_transaction_id)
+        .outerjoin(NudgeWatermark, NudgeWatermark.user_id == User.id)
+        .where(User.id > after_user, User.is_active.isnot(False))
+        .order_by(User.id)
+        .limit(limit)
+    )
+
+
+def _watermark_upsert(marks: list[dict]):
+    stmt = pg_insert(NudgeWatermark).values(marks)
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "last_transaction_id": stmt.excluded.last_transaction_id,
+            "alerts_sent": NudgeWatermark.alerts_sent + stmt.excluded.alerts_sent,
+            "last_nudged_at": func.now(),
+        },
+    )
+
+
+async def _deliver(db, user_id: int, latest_tx: int, alerts: list[str]) -> None:
+    """ Alerts land in the advisor conversation (and open sockets), committed with the watermark """
+    rows = [Conversation(user_id=user_id, sender="advisor", message=text) for text in alerts]
+    db.add_all(rows)
+    await db.execute(_watermark_upsert(
+        [{"user_id": user_id, "last_transaction_id": latest_tx, "alerts_sent": len(alerts)}]
+    ))
+    await db.commit()
+    for row in rows:
+        await db.refresh(row)
+        await publish_message(row)
+
+
+async def nudge_user(session_factory, user_id: int, latest_tx: int, stats: NudgeStats, timeout: float) -> int:
+    """
+    Alerts for one user; returns how many were sent. Only the analysis is
+    bounded by `timeout` (asyncio.TimeoutError): once delivery starts it
+    runs to its commit, so a slow user can't end up alerted without a
+    watermark. With nothing to send, the caller batches the watermark.
+    """
+    days = settings.NUDGER_WINDOW_DAYS
+    async with session_factory() as db:
+        async def analyze():
+            if settings.NUDGER_USE_LLM:
+                profile, transactions = await load_agent_inputs(db, user_id, days, None)
+                return await asyncio.to_thread(get_agent().coach, profile, transactions)
+            return {"spending_analysis": await spending_analysis(db, user_id, days, None), "budget_plan": {}}
+
+        with stats.stage("analyze"):
+            result = await asyncio.wait_for(analyze(), timeout)
+
+        with stats.stage("alerts"):
+            alerts = FinancialCoachAgent.generate_alerts(result)
+
+        if alerts:
+            with stats.stage("deliver"):
+                await _deliver(db, user_id, latest_tx, alerts)
+    return len(alerts)
+
+
+async def _flush_watermarks(session_factory, marks: list[dict], stats: NudgeStats) -> None:
+    if not marks:
+        return
+    with stats.stage("watermark"):
+        async with session_factory() as db:
+            await db.execute(_watermark_upsert(marks))
+            await db.commit()
+
+
+async def run_fleet(
+    session_factory=None,
+    batch_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> dict:
+    """ One full pass over all active users; returns NudgeStats.as_dict() """
+    session_factory = session_factory or AsyncSessionLocal
+    batch_size = batch_size or settings.NUDGER_BATCH_SIZE
+    concurrency = concurrency or settings.NUDGER_CONCURRENCY
+    timeout = timeout or settings.NUDGER_USER_TIMEOUT_SECONDS
+
+    stats = NudgeStats()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=batch_size)
+    pending: list[dict] = []
+    flushes: list[asyncio.Task] = []
+
+    async def scan():
+        after = 0
+        while True:
+            with stats.stage("scan"):
+                async with session_factory() as db:
+                    rows = (await db.execute(_scan_query(after, batch_size))).all()
+            if not rows:
+                return
+            after = rows[-1].id
+            stats.scanned += len(rows)
+            for r in rows:
+                if r.latest_tx is None or r.latest_tx <= (r.last_transaction_id or 0):
+                    stats.skipped += 1
+                    continue
+                await queue.put((r.id, r.latest_tx))   # blocks while workers are behind
+            logger.info("nudger: scanned %d users (through id %d)", stats.scanned, after)
+
+    async def worker():
+        nonlocal pending
+        while True:
+            user_id, latest_tx = await queue.get()
+            try:
+                sent = await nudge_user(session_factory, user_id, latest_tx, stats, timeout)
+            except asyncio.TimeoutError:
+                stats.timeouts += 1
+                logger.warning("nudger: user %s timed out after %.1fs", user_id, timeout)
+                continue
+            except Exception:
+                stats.failures += 1
+                logger.exception("nudger: user %s failed", user_id)
+                continue
+            finally:
+                queue.task_done()
+
+            stats.nudged += 1
+            stats.alerts += sent
+            if sent:
+                continue   # _deliver already moved the watermark
+            pending.append({"user_id": user_id, "last_transaction_id": latest_tx, "alerts_sent": 0})
+            if len(pending) >= batch_size:
+                marks, pending = pending, []
+                flushes.append(asyncio.create_task(_flush_watermarks(session_factory, marks, stats)))
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        await scan()
+        await queue.join()
+    finally:
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    await asyncio.gather(*flushes)
+    await _flush_watermarks(session_factory, pending, stats)
+
+    result = stats.as_dict()
+    logger.info("nudger pass finished: %s", result)
+    return result
+
+
+if __name__ == "__main__":
+    import json
+
+    from app.core.database import engine
+
+    async def main():
+        from app.workers.ws import broker
+
+        result = await run_fleet()
+        await engine.dispose()
+        await broker.close()
+        print(json.dumps(result, indent=2))
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
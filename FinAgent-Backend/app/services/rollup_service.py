@@ -0,0 +1,134 @@
+"""
+Incremental maintenance of the transaction_rollups table.
+
+Writers call `apply_rollup_deltas` with the rows they added (+1) or removed
+(-1) before committing, so the rollup moves in the same DB transaction as
+the transactions themselves. A freshly created table (migration or
+create_all) is backfilled from the existing transactions. `rebuild_rollups` recomputes it from scratch:
+
+    python -m app.services.rollup_service            # every user
+    python -m app.services.rollup_service --user-id 7
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import DDL, delete, event, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.transaction_rollup import TransactionRollup
+
+UNCATEGORIZED = ""
+
+
+def month_bucket(date: datetime) -> datetime:
+    """ First instant of the (UTC) month `date` falls in """
+    if date.tzinfo is not None:
+        date = date.astimezone(timezone.utc)
+    return datetime(date.year, date.month, 1, tzinfo=timezone.utc)
+
+
+def rollup_delta(user_id: int, date: Optional[datetime], category: Optional[str], type_: str, amount: float, sign: int):
+    """
+    One (key, total, count) contribution; sign is +1 for an added row, -1
+    for a removed one. Undated rows have no month and are left out of the
+    rollup (as in REBUILD_SQL), so they contribute None.
+    """
+    if date is None:
+        return None
+    key = (user_id, month_bucket(date), category or UNCATEGORIZED, type_)
+    return key, sign * amount, sign
+
+
+async def apply_rollup_deltas(db: AsyncSession, deltas: Iterable):
+    """
+    Fold `deltas` into transaction_rollups with one INSERT ... ON CONFLICT.
+    Does not commit; the caller's commit makes it atomic with its writes.
+    None entries (undated rows) are skipped.
+
+    Rows go in primary-key order so concurrent writers lock the rollup rows
+    they share in the same order and can't deadlock each other.
+    """
+    merged = defaultdict(lambda: [0.0, 0])
+    for delta in deltas:
+        if delta is None:
+            continue
+        key, total, count = delta
+        merged[key][0] += total
+        merged[key][1] += count
+
+    rows = [
+        {"user_id": k[0], "month": k[1], "category": k[2], "type": k[3], "total": t, "count": c}
+        for k, (t, c) in sorted(merged.items())
+        if c != 0 or t != 0
+    ]
+    if not rows:
+        return
+
+    stmt = pg_insert(TransactionRollup).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "month", "category", "type"],
+        set_={
+            "total": TransactionRollup.total + stmt.excluded.total,
+            "count": TransactionRollup.count + stmt.excluded.count,
+        },
+    )
+    await db.execute(stmt)
+
+
+REBUILD_SQL = """
+INSERT INTO transaction_rollups (user_id, month, category, type, total, count)
+SELECT user_id,
+       date_trunc('month', date AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+       COALESCE(category, ''),
+       type,
+       SUM(amount),
+       COUNT(*)
+FROM transactions
+WHERE user_id IS NOT NULL AND date IS NOT NULL {user_filter}
+GROUP BY 1, 2, 3, 4
+"""
+
+
+# STARTUP_MODE=create_all on a database that already has transactions:
+# backfill the rollup the moment the table is created, as the migration does
+event.listen(
+    TransactionRollup.__table__,
+    "after_create",
+    DDL(REBUILD_SQL.format(user_filter="")),
+)
+
+
+async def rebuild_rollups(db: AsyncSession, user_id: Optional[int] = None):
+    """ Recompute the rollup (for one user or everyone) from raw transactions """
+    wipe = delete(TransactionRollup)
+    params = {}
+    user_filter = ""
+    if user_id is not None:
+        wipe = wipe.where(TransactionRollup.user_id == user_id)
+        params["user_id"] = user_id
+        user_filter = "AND user_id = :user_id"
+
+    await db.execute(wipe)
+    await db.execute(text(REBUILD_SQL.format(user_filter=user_filter)), params)
+    await db.commit()
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+
+    from app.core.database import AsyncSessionLocal, engine
+
+    parser = argparse.ArgumentParser(description="Rebuild transaction_rollups from transactions")
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+
+    async def main():
+        async with AsyncSessionLocal() as db:
+            await rebuild_rollups(db, args.user_id)
+        await engine.dispose()
+        print("transaction_rollups rebuilt" + (f" for user {args.user_id}" if args.user_id else ""))
+
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+"""
+Chunked bank-statement parsing for CSV/XLSX imports.
+
+Column inference and normalization follow infer_columns/preprocess in
+behavioral-model.py, but operate on one fixed-size chunk at a time so an
+import never holds more than `chunk_rows` rows in memory. That script is a
+Colab notebook (hyphenated name, matplotlib/IPython imports, runs on import)
+and can't be imported from here, so infer_columns is re-implemented over
+the same candidate names. It differs in two ways: separate debit and credit
+columns are both kept rather than just the first one found, and a statement
+with no date or amount column is rejected up front.
+"""
+from typing import Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+SUPPORTED_SUFFIXES = (".csv", ".xlsx")
+
+DATE_COLUMNS = ['date', 'transaction_date', 'txn_date', 'timestamp']
+AMOUNT_COLUMNS = ['amount', 'amt', 'value', 'transaction_amount', 'debit', 'credit']
+CATEGORY_COLUMNS = ['category', 'cat', 'expense_category', 'label']
+MERCHANT_COLUMNS = ['merchant', 'vendor', 'payee', 'description', 'narration']
+TYPE_COLUMNS = ['txn_type', 'type', 'transaction_type', 'debit_credit', 'debit/credit']
+
+DEBIT_MARKERS = ('debit', 'dr', 'expense')
+CREDIT_MARKERS = ('credit', 'cr', 'income')
+
+
+def infer_columns(columns) -> Dict[str, str]:
+    """ Map our field names -> the statement's own column names """
+    cols = {str(c).lower(): c for c in columns}
+    mapping = {}
+    for field, candidates in (
+        ('date', DATE_COLUMNS),
+        ('amount', AMOUNT_COLUMNS),
+        ('category', CATEGORY_COLUMNS),
+        ('merchant', MERCHANT_COLUMNS),
+        ('txn_type', TYPE_COLUMNS),
+    ):
+        for candidate in candidates:
+            if candidate in cols:
+                mapping[field] = cols[candidate]
+                break
+
+    # Separate debit/credit columns: derive the amount from both, not just one of them
+    if 'debit' in cols and 'credit' in cols and str(mapping.get('amount', '')).lower() in ('debit', 'credit'):
+        del mapping['amount']
+        mapping['debit'] = cols['debit']
+        mapping['credit'] = cols['credit']
+
+    if 'date' not in mapping:
+        raise ValueError('No date column found. Include a date/transaction_date column.')
+    if 'amount' not in mapping and 'debit' not in mapping:
+        raise ValueError('No amount column found. Include an amount column.')
+
+    return mapping
+
+
+def iter_statement_chunks(path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """ Yield the statement as DataFrames of at most `chunk_rows` rows """
+    if path.lower().endswith(".csv"):
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+    elif path.lower().endswith(".xlsx"):
+        yield from _iter_xlsx_chunks(path, chunk_rows)
+    else:
+        raise ValueError(f"Unsupported file type; expected one of {SUPPORTED_SUFFIXES}")
+
+
+def _iter_xlsx_chunks(path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    # read_only mode streams rows from the zip instead of building the whole sheet
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(c) if c is not None else f"column_{i}" for i, c in enumerate(header)]
+
+        batch = []
+        for row in rows:
+            batch.append(row[:len(columns)])
+            if len(batch) >= chunk_rows:
+                yield pd.DataFrame(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns)
+    finally:
+        wb.close()
+
+
+def normalize_chunk(df: pd.DataFrame, mapping: Dict[str, str]) -> Tuple[List[Dict], int]:
+    """
+    Turn one raw chunk into transaction rows (amount, type, merchant,
+    category, date, source='csv').
+
+    Returns (rows, skipped) where skipped counts lines without a usable
+    date or amount.
+    """
+    df = df.rename(columns={src: field for field, src in mapping.items()})
+    total = len(df)
+
+    if 'amount' not in df.columns:
+        credit = pd.to_numeric(df['credit'], errors='coerce').fillna(0)
+        debit = pd.to_numeric(df['debit'], errors='coerce').fillna(0)
+        df['amount'] = credit - debit
+
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df['amount'] = pd.to_numeric(df['amount'], errors='coerce')
+    df = df[df['date'].notna() & df['amount'].notna()].copy()
+
+    if 'txn_type' in df.columns:
+        txn_type = df['txn_type'].astype(str).str.lower()
+        debit_mask = txn_type.str.contains('|'.join(DEBIT_MARKERS))
+        df.loc[debit_mask, 'amount'] = -df.loc[debit_mask, 'amount'].abs()
+        credit_mask = txn_type.str.contains('|'.join(CREDIT_MARKERS))
+        df.loc[credit_mask, 'amount'] = df.loc[credit_mask, 'amount'].abs()
+
+    if 'category' in df.columns:
+        category = df['category'].where(df['category'].notna(), None)
+        df['category'] = category.map(lambda c: str(c).strip().title() if c is not None else None)
+    else:
+        df['category'] = None
+
+    if 'merchant' in df.columns:
+        df['merchant'] = df['merchant'].where(df['merchant'].notna(), None)
+        df['merchant'] = df['merchant'].map(lambda m: str(m).strip() if m is not None else None)
+    else:
+        df['merchant'] = None
+
+    rows = [
+        {
+            "amount": abs(float(amount)),
+            "type": "debit" if amount < 0 else "credit",
+            "merchant": merchant,
+            "category": category,
+            "date": date.to_pydatetime(),
+            "source": "csv",
+        }
+        for amount, merchant, category, date in zip(
+            df['amount'], df['merchant'], df['category'], df['date']
+        )
+    ]
+    return rows, total - len(rows)
@@ -0,0 +1,142 @@
+"""
+Refresh-token rotation backed by the refresh_tokens table.
+
+Every refresh token carries a jti that is recorded when issued and revoked
+the moment it is exchanged, so each token works exactly once. Presenting an
+already-revoked token is treated as theft and revokes every live token the
+user has.
+
+Expired rows are removed in batches by:
+
+    python -m app.services.token_service purge
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from jose import jwt, JWTError
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+from app.services.auth_service import create_refresh_token, REFRESH_TOKEN_EXPIRE_DAYS
+
+PURGE_BATCH_SIZE = 10_000
+
+
+class InvalidRefreshToken(Exception):
+    pass
+
+
+async def issue_refresh_token(db: AsyncSession, user_id: int) -> str:
+    """ Mint a refresh token and record its jti (committed by the caller) """
+    jti = uuid.uuid4().hex
+    expires_at = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    db.add(RefreshToken(jti=jti, user_id=user_id, expires_at=expires_at))
+    return create_refresh_token({"sub": str(user_id), "jti": jti, "type": "refresh"})
+
+
+def _decode(token: str) -> dict:
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+    except JWTError:
+        raise InvalidRefreshToken("Invalid refresh token")
+
+    # tokens minted before rotation existed have no jti and cannot be revoked
+    if payload.get("type") != "refresh" or not payload.get("jti") or not payload.get("sub"):
+        raise InvalidRefreshToken("Invalid refresh token")
+    return payload
+
+
+async def _revoke_all(db: AsyncSession, user_id: int) -> None:
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked.is_(False))
+        .values(revoked=True)
+    )
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> tuple[int, str]:
+    """
+    Exchange `token` for a new refresh token: the old jti is revoked and the
+    new one recorded in the same DB transaction. Returns (user_id, new token).
+
+    The revocation check is the rotation itself: a conditional UPDATE that
+    only matches a live jti, so validating costs no extra round trip.
+    """
+    payload = _decode(token)
+    jti = payload["jti"]
+    user_id = int(payload["sub"])
+
+    # Check-and-revoke in one statement; racing refreshes can't both win
+    res = await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == jti,
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked.is_(False),
+            RefreshToken.expires_at > datetime.now(timezone.utc),
+        )
+        .values(revoked=True)
+        .returning(RefreshToken.id)
+    )
+    if res.scalar_one_or_none() is None:
+        # unknown, expired, or already used: treat reuse as compromise
+        await _revoke_all(db, user_id)
+        await db.commit()
+        raise InvalidRefreshToken("Refresh token has been revoked")
+
+    new_token = await issue_refresh_token(db, user_id)
+    await db.commit()
+    return user_id, new_token
+
+
+async def revoke_refresh_token(db: AsyncSession, token: str) -> None:
+    """ Logout: revoke this token's jti (no-op if it's already dead) """
+    payload = _decode(token)
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.jti == payload["jti"], RefreshToken.user_id == int(payload["sub"]))
+        .values(revoked=True)
+    )
+    await db.commit()
+
+
+async def purge_expired_tokens(db: AsyncSession) -> int:
+    """ Delete expired refresh_tokens rows PURGE_BATCH_SIZE at a time """
+    now = datetime.now(timezone.utc)
+    purged = 0
+    while True:
+        batch = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at <= now)
+            .limit(PURGE_BATCH_SIZE)
+            .scalar_subquery()
+        )
+        res = await db.execute(
+            delete(RefreshToken).where(RefreshToken.id.in_(batch)).returning(RefreshToken.id)
+        )
+        deleted = len(res.all())
+        await db.commit()   # short transactions: don't hold locks across the whole purge
+        purged += deleted
+        if deleted < PURGE_BATCH_SIZE:
+            return purged
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.core.database import AsyncSessionLocal, engine
+
+    parser = argparse.ArgumentParser(description="Refresh-token maintenance")
+    parser.add_argument("command", choices=["purge"])
+    args = parser.parse_args()
+
+    async def main():
+        async with AsyncSessionLocal() as db:
+            purged = await purge_expired_tokens(db)
+        await engine.dispose()
+        print(f"purged {purged} expired refresh tokens")
+
+    asyncio.run(main())
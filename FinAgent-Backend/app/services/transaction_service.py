@@ -1,7 +1,51 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, DateTime
+from sqlalchemy import select, insert, update, delete, func, tuple_, and_, or_, literal_column, DateTime
 from app.models.transactions import Transaction
+from app.models.transaction_rollup import TransactionRollup
+from app.core.cache import cache, TRANSACTIONS
+from app.services.rollup_service import apply_rollup_deltas, rollup_delta, UNCATEGORIZED
 from datetime import datetime
+import base64
+import json
+
+GRANULARITIES = ("day", "week", "month", "quarter", "year")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# rows per multi-row INSERT; 7 bound params each keeps us far below asyncpg's 32767 cap
+BULK_CHUNK_SIZE = 1000
+TRANSACTION_TYPES = ("debit", "credit")
+
+
+# ---------------------------------------------------------
+# KEYSET CURSORS
+# ---------------------------------------------------------
+def encode_cursor(tx: Transaction) -> str:
+    """ Opaque cursor pointing just past `tx` in (date desc, id desc) order """
+    raw = json.dumps([tx.date.isoformat() if tx.date else None, tx.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, int]:
+    """ Inverse of encode_cursor; raises ValueError on anything malformed """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_str, tx_id = json.loads(base64.urlsafe_b64decode(padded))
+        return (datetime.fromisoformat(date_str) if date_str else None), int(tx_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _after_cursor(after_date: datetime | None, after_id: int):
+    # Postgres sorts NULL dates first under DESC, so a cursor on an undated
+    # row continues through the remaining undated ids, then every dated row
+    if after_date is None:
+        return or_(
+            and_(Transaction.date.is_(None), Transaction.id < after_id),
+            Transaction.date.isnot(None),
+        )
+    return tuple_(Transaction.date, Transaction.id) < tuple_(after_date, after_id)
 
 
 async def create_transaction(db: AsyncSession, user_id: int, data):
@@ -15,19 +59,127 @@ async def create_transaction(db: AsyncSession, user_id: int, data):
         user_id=user_id
     )
     db.add(tx)
+    await apply_rollup_deltas(db, [
+        rollup_delta(user_id, tx.date, tx.category, tx.type, tx.amount, +1)
+    ])
     await db.commit()
+    await cache.invalidate(TRANSACTIONS, user_id)
     await db.refresh(tx)
     return tx
 
 
-async def list_transactions(db: AsyncSession, user_id: int):
+async def bulk_create_transactions(db: AsyncSession, user_id: int, items: list):
+    """
+    Insert many transactions with one multi-row INSERT ... RETURNING per
+    chunk, all inside a single DB transaction.
+
+    `items` must already be validated TransactionCreate objects.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "amount": data.amount,
+            "type": data.type,
+            "merchant": data.merchant,
+            "category": data.category,
+            "date": data.date or now,
+            "source": data.source or "manual",
+            "user_id": user_id,
+        }
+        for data in items
+    ]
+
+    created = []
+    try:
+        for start in range(0, len(rows), BULK_CHUNK_SIZE):
+            chunk = rows[start:start + BULK_CHUNK_SIZE]
+            res = await db.execute(
+                insert(Transaction).values(chunk).returning(Transaction)
+            )
+            created.extend(res.scalars().all())
+        await apply_rollup_deltas(db, (
+            rollup_delta(user_id, r["date"], r["category"], r["type"], r["amount"], +1)
+            for r in rows
+        ))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    await cache.invalidate(TRANSACTIONS, user_id)
+    return created
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def apply_filters(q, filters):
+    """
+    Push a TransactionFilter into the WHERE clause.
+
+    Date ranges ride ix_transactions_user_id_date_id, category lists use
+    ix_transactions_user_id_category_date and merchant prefixes use the
+    lower(merchant) text_pattern_ops index.
+    """
+    if filters is None:
+        return q
+    if filters.date_from is not None:
+        q = q.where(Transaction.date >= filters.date_from)
+    if filters.date_to is not None:
+        q = q.where(Transaction.date < filters.date_to)
+    if filters.categories:
+        q = q.where(Transaction.category.in_(filters.categories))
+    if filters.merchant_prefix:
+        prefix = _escape_like(filters.merchant_prefix.lower())
+        q = q.where(func.lower(Transaction.merchant).like(prefix + "%", escape="\\"))
+    if filters.type is not None:
+        q = q.where(Transaction.type == filters.type)
+    if filters.min_amount is not None:
+        q = q.where(Transaction.amount >= filters.min_amount)
+    if filters.max_amount is not None:
+        q = q.where(Transaction.amount <= filters.max_amount)
+    return q
+
+
+async def list_transactions(
+    db: AsyncSession,
+    user_id: int,
+    limit: int | None = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    filters=None,
+):
+    """
+    Return one page of the user's transactions, newest first, plus the
+    cursor for the next page (None when this is the last page).
+
+    Walks ix_transactions_user_id_date_id, so every page is an index range
+    scan regardless of how deep into the history the cursor points.
+    `filters` (a TransactionFilter) narrows the rows in SQL. limit=None
+    returns everything from the cursor on in one go.
+    """
     q = (
         select(Transaction)
         .where(Transaction.user_id == user_id)
-        .order_by(Transaction.date.desc())
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
     )
+    q = apply_filters(q, filters)
+    if limit is not None:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        q = q.limit(limit + 1)   # one extra row tells us whether a next page exists
+
+    if cursor:
+        q = q.where(_after_cursor(*decode_cursor(cursor)))
+
     res = await db.execute(q)
-    return res.scalars().all()
+    rows = res.scalars().all()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+
+    return rows, next_cursor
 
 
 async def get_transaction(db: AsyncSession, tx_id: int):
@@ -36,34 +188,96 @@ async def get_transaction(db: AsyncSession, tx_id: int):
     return res.scalar_one_or_none()
 
 
-async def update_transaction(db: AsyncSession, tx: Transaction, updates: dict):
-    for key, value in updates.items():
-        if value is not None:
-            setattr(tx, key, value)
+async def update_transactions(db: AsyncSession, user_id: int, tx_ids: list[int], updates: dict):
+    """
+    Apply `updates` to every listed transaction the user owns with a single
+    UPDATE ... RETURNING. A CTE locks and captures the old values so the
+    rollup can be moved without a separate read. Ids the user doesn't own
+    are silently skipped; the returned list says which rows changed.
+    """
+    updates = {k: v for k, v in updates.items() if v is not None}
+    if not updates:
+        res = await db.execute(
+            select(Transaction).where(Transaction.id.in_(tx_ids), Transaction.user_id == user_id)
+        )
+        return res.scalars().all()
 
-    db.add(tx)
+    old = (
+        select(
+            Transaction.id, Transaction.date, Transaction.category,
+            Transaction.type, Transaction.amount,
+        )
+        .where(Transaction.id.in_(tx_ids), Transaction.user_id == user_id)
+        .with_for_update()
+        .cte("old")
+    )
+    stmt = (
+        update(Transaction)
+        .where(Transaction.id == old.c.id)
+        .values(**updates)
+        .returning(Transaction, old.c.date, old.c.category, old.c.amount)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    res = await db.execute(stmt)
+    rows = res.all()
+
+    deltas = []
+    for tx, old_date, old_category, old_amount in rows:
+        deltas.append(rollup_delta(user_id, old_date, old_category, tx.type, old_amount, -1))
+        deltas.append(rollup_delta(user_id, tx.date, tx.category, tx.type, tx.amount, +1))
+    await apply_rollup_deltas(db, deltas)
     await db.commit()
-    await db.refresh(tx)
-    return tx
+
+    if rows:
+        await cache.invalidate(TRANSACTIONS, user_id)
+    return [row[0] for row in rows]
+
+
+async def update_transaction(db: AsyncSession, user_id: int, tx_id: int, updates: dict):
+    """ Single-row update_transactions; None when the user has no such transaction """
+    updated = await update_transactions(db, user_id, [tx_id], updates)
+    return updated[0] if updated else None
 
 
-async def delete_transaction(db: AsyncSession, tx: Transaction):
-    await db.delete(tx)
+async def delete_transactions(db: AsyncSession, user_id: int, tx_ids: list[int]) -> list[int]:
+    """ DELETE ... RETURNING the user's listed transactions; returns the ids actually removed """
+    res = await db.execute(
+        delete(Transaction)
+        .where(Transaction.id.in_(tx_ids), Transaction.user_id == user_id)
+        .returning(
+            Transaction.id, Transaction.date, Transaction.category,
+            Transaction.type, Transaction.amount,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = res.all()
+
+    await apply_rollup_deltas(db, [
+        rollup_delta(user_id, r.date, r.category, r.type, r.amount, -1) for r in rows
+    ])
     await db.commit()
-    return True
 
+    if rows:
+        await cache.invalidate(TRANSACTIONS, user_id)
+    return [r.id for r in rows]
 
-async def monthly_summary(db: AsyncSession, user_id: int):
-    month_trunc = func.date_trunc('month', Transaction.date)
 
+async def delete_transaction(db: AsyncSession, user_id: int, tx_id: int) -> bool:
+    return bool(await delete_transactions(db, user_id, [tx_id]))
+
+
+# ---------------------------------------------------------
+# SUMMARIES (served from transaction_rollups)
+# ---------------------------------------------------------
+async def monthly_summary(db: AsyncSession, user_id: int):
     q = (
         select(
-            month_trunc.label("month"),
-            func.sum(Transaction.amount).label("total")
+            TransactionRollup.month,
+            func.sum(TransactionRollup.total).label("total")
         )
-        .where(Transaction.user_id == user_id)
-        .group_by(month_trunc)
-        .order_by(month_trunc.desc())
+        .where(TransactionRollup.user_id == user_id, TransactionRollup.count > 0)
+        .group_by(TransactionRollup.month)
+        .order_by(TransactionRollup.month.desc())
     )
 
     result = await db.execute(q)
@@ -84,14 +298,15 @@ async def monthly_summary(db: AsyncSession, user_id: int):
 
 
 async def category_summary(db: AsyncSession, user_id: int):
+    total = func.sum(TransactionRollup.total)
     q = (
         select(
-            Transaction.category,
-            func.sum(Transaction.amount).label("total")
+            TransactionRollup.category,
+            total.label("total")
         )
-        .where(Transaction.user_id == user_id)
-        .group_by(Transaction.category)
-        .order_by(func.sum(Transaction.amount).desc())
+        .where(TransactionRollup.user_id == user_id, TransactionRollup.count > 0)
+        .group_by(TransactionRollup.category)
+        .order_by(total.desc())
     )
 
     res = await db.execute(q)
@@ -99,8 +314,78 @@ async def category_summary(db: AsyncSession, user_id: int):
 
     return [
         {
-            "category": r.category or "Uncategorized",
+            "category": r.category if r.category != UNCATEGORIZED else "Uncategorized",
             "total": float(r.total)
         }
         for r in rows
     ]
+
+
+async def timeframe_summary(
+    db: AsyncSession,
+    user_id: int,
+    granularity: str = "month",
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    category: str | None = None,
+):
+    """
+    Debit/credit totals, counts and averages per day/week/month/quarter/year
+    bucket, plus whole-window totals per type, from one GROUPING SETS pass
+    over the user's transactions (the SQL counterpart of
+    aggregate_timeframes in behavioral-model.py).
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {GRANULARITIES}")
+
+    # Literals, not bind params: Postgres must see the SELECT and GROUP BY
+    # bucket expressions as identical
+    bucket = func.date_trunc(
+        literal_column(f"'{granularity}'"),
+        Transaction.date.op("AT TIME ZONE")(literal_column("'UTC'")),
+    )
+
+    q = (
+        select(
+            bucket.label("period"),
+            Transaction.type,
+            func.sum(Transaction.amount).label("total"),
+            func.count().label("count"),
+            func.avg(Transaction.amount).label("avg"),
+            func.grouping(bucket).label("is_window_total"),
+        )
+        # Undated rows have no bucket; leaving them out keeps the window
+        # totals equal to the sum of the buckets
+        .where(Transaction.user_id == user_id, Transaction.date.isnot(None))
+        .group_by(func.grouping_sets(tuple_(bucket, Transaction.type), tuple_(Transaction.type)))
+    )
+    if date_from is not None:
+        q = q.where(Transaction.date >= date_from)
+    if date_to is not None:
+        q = q.where(Transaction.date < date_to)
+    if category is not None:
+        q = q.where(Transaction.category == category)
+
+    res = await db.execute(q)
+
+    empty = lambda: {"total": 0.0, "count": 0, "avg": 0.0}
+    buckets: dict = {}
+    totals = {t: empty() for t in TRANSACTION_TYPES}
+
+    for row in res.all():
+        stats = {"total": float(row.total), "count": int(row.count), "avg": float(row.avg)}
+        if row.is_window_total:
+            totals[row.type] = stats
+            continue
+        period = row.period.date().isoformat()
+        entry = buckets.setdefault(period, {"period": period, **{t: empty() for t in TRANSACTION_TYPES}})
+        entry[row.type] = stats
+
+    return {
+        "granularity": granularity,
+        "date_from": date_from.isoformat() if date_from else None,
+        "date_to": date_to.isoformat() if date_to else None,
+        "category": category,
+        "buckets": [buckets[k] for k in sorted(buckets)],
+        "totals": totals,
+    }
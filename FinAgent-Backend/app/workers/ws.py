@@ -0,0 +1,208 @@
+"""
+Per-user WebSocket channel for advisor messages.
+
+Clients connect to /advisor/ws?token=<access token> and receive every
+Conversation row saved for them (advisor replies and their own messages
+from other devices) as JSON, instead of polling /advisor/messages.
+
+Rows are published through a broker. With REDIS_URL set, each uvicorn
+worker publishes to Redis pub/sub and runs one listener that hands messages
+to its own sockets, so a reply saved on worker A reaches a socket held by
+worker B. Without Redis an in-process broker does the same within one
+worker (single-node dev and tests).
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from collections import defaultdict
+
+from fastapi import APIRouter, WebSocket, status
+from jose import jwt, JWTError
+
+from app.core.cache import LoopLocalRedis
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "advisor:user:"
+# Per-socket backlog; a client this far behind catches up via /advisor/messages?after=
+QUEUE_SIZE = 100
+
+
+class MemoryBroker:
+    """ Fans messages out to the sockets held by this process """
+
+    def __init__(self):
+        self._subscribers: dict[int, set[asyncio.Queue]] = defaultdict(set)
+        self.delivered = 0
+        self.dropped = 0
+
+    async def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    async def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def _deliver(self, user_id: int, payload: dict) -> None:
+        for queue in self._subscribers.get(user_id, ()):
+            try:
+                queue.put_nowait(payload)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                self.dropped += 1
+                logger.warning("ws backlog full for user %s; dropping message", user_id)
+
+    async def publish(self, user_id: int, payload: dict) -> None:
+        self._deliver(user_id, payload)
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {
+            "broker": type(self).__name__,
+            "users": len(self._subscribers),
+            "sockets": sum(len(q) for q in self._subscribers.values()),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+class RedisBroker(MemoryBroker):
+    """
+    Publishes through Redis. One pattern subscription per worker receives
+    every user's channel and delivers locally; sockets never talk to Redis.
+    """
+
+    def __init__(self, url: str):
+        super().__init__()
+        # Celery tasks publish from a new event loop per job; see LoopLocalRedis
+        self._redis = LoopLocalRedis(url)
+        self._listener: asyncio.Task | None = None
+
+    @property
+    def client(self):
+        return self._redis.client
+
+    async def subscribe(self, user_id: int) -> asyncio.Queue:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        return await super().subscribe(user_id)
+
+    async def publish(self, user_id: int, payload: dict) -> None:
+        # Delivery (including to this worker's own sockets) comes back via _listen
+        await self.client.publish(f"{CHANNEL_PREFIX}{user_id}", json.dumps(payload, default=str))
+
+    async def _listen(self) -> None:
+        backoff = 0.5
+        while True:
+            try:
+                pubsub = self.client.pubsub()
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                backoff = 0.5
+                async for msg in pubsub.listen():
+                    if msg["type"] != "pmessage":
+                        continue
+                    user_id = int(msg["channel"][len(CHANNEL_PREFIX):])
+                    self._deliver(user_id, json.loads(msg["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("ws redis listener failed; reconnecting in %.1fs", backoff, exc_info=True)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        await self._redis.aclose()
+
+
+def _build_broker() -> MemoryBroker:
+    if settings.REDIS_URL:
+        return RedisBroker(settings.REDIS_URL)
+    return MemoryBroker()
+
+
+broker = _build_broker()
+
+
+async def publish_message(msg) -> None:
+    """ Push a saved Conversation row to the owner's open sockets """
+    payload = {
+        "id": msg.id,
+        "sender": msg.sender,
+        "message": msg.message,
+        "created_at": msg.created_at.isoformat() if msg.created_at else None,
+    }
+    try:
+        await broker.publish(msg.user_id, payload)
+    except Exception:
+        # the row is saved either way; clients can still page it in
+        logger.warning("ws publish failed", exc_info=True)
+
+
+# -----------------------------------------------------------
+# WebSocket endpoint
+# -----------------------------------------------------------
+router = APIRouter(prefix="/advisor", tags=["advisor"])
+
+
+def _claims_from_token(token: str | None) -> tuple[int, float | None] | None:
+    """ (user_id, exp) for a usable access token, else None """
+    # Browsers can't set headers on a WebSocket, so the token comes as ?token=
+    if not token:
+        return None
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+    except JWTError:
+        return None
+    if payload.get("sub") is None or payload.get("active") is False:
+        return None
+    return int(payload["sub"]), payload.get("exp")
+
+
+@router.websocket("/ws")
+async def advisor_socket(websocket: WebSocket, token: str | None = None):
+    claims = _claims_from_token(token)
+    if claims is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    user_id, exp = claims
+
+    await websocket.accept()
+    queue = await broker.subscribe(user_id)
+
+    async def push():
+        while True:
+            await websocket.send_json(await queue.get())
+
+    async def drain():
+        # Incoming frames are ignored; this only notices the disconnect
+        while True:
+            await websocket.receive_text()
+
+    tasks = [asyncio.create_task(push()), asyncio.create_task(drain())]
+    # The session lives no longer than its token; clients reconnect with a fresh one
+    timeout = max(exp - time.time(), 0) if exp is not None else None
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        if not done:
+            with contextlib.suppress(Exception):   # the client may have left at the same moment
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="token expired")
+    finally:
+        for task in tasks:
+            task.cancel()
+        # WebSocketDisconnect / send errors end up here; nothing to report
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await broker.unsubscribe(user_id, queue)
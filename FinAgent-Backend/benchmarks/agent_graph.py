@@ -0,0 +1,96 @@
+"""
+End-to-end latency of the coaching graph with a stubbed LLM: the old
+straight chain of nodes vs the fan-out where build_budget runs alongside
+generate_insights -> create_recommendations.
+
+    python -m benchmarks.agent_graph
+    BENCH_LLM_DELAY_MS=800 python -m benchmarks.agent_graph
+
+Every LLM call sleeps BENCH_LLM_DELAY_MS and returns canned content, so the
+difference is purely how many calls sit on the critical path (4 vs 3).
+"""
+import json
+import os
+import statistics
+import time
+
+from app.langgraph.Financial_Coaching_Agent import FinancialCoachAgent
+
+DELAY_MS = float(os.environ.get("BENCH_LLM_DELAY_MS", "300"))
+RUNS = int(os.environ.get("BENCH_RUNS", "5"))
+
+# The graph as it was before the fan-out: one node after another
+LINEAR = {
+    "analyze_spending": [],
+    "generate_insights": ["analyze_spending"],
+    "create_recommendations": ["generate_insights"],
+    "build_budget": ["create_recommendations"],
+    "generate_coaching": ["build_budget"],
+}
+
+
+class _Reply:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class StubLLM:
+    """ Fixed-latency stand-in for the chat model """
+
+    def __init__(self, delay_ms: float):
+        self.delay = delay_ms / 1000
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        time.sleep(self.delay)
+        prompt = messages[0].content
+        if "monthly budget plan" in prompt:
+            return _Reply(json.dumps({
+                "categories": {"Food": 300},
+                "target_savings_rate": 20,
+                "monthly_savings_target": 400,
+                "financial_goal": "Build an emergency fund",
+            }))
+        if "coaching message" in prompt:
+            return _Reply("Keep it up!")
+        return _Reply(json.dumps(["stub item one", "stub item two"]))
+
+
+def make_inputs():
+    profile = {"id": 1, "name": "Bench", "type": "student"}
+    transactions = [
+        {"id": i, "amount": 10.0 + i, "type": "expense" if i % 4 else "income",
+         "category": ["Food", "Travel", "Rent"][i % 3], "merchant": f"m{i}",
+         "date": "2025-12-01T00:00:00", "source": "bench"}
+        for i in range(200)
+    ]
+    return profile, transactions
+
+
+def time_graph(agent: FinancialCoachAgent, profile, transactions) -> float:
+    samples = []
+    for _ in range(RUNS):
+        t0 = time.perf_counter()
+        result = agent.coach(profile, transactions)
+        samples.append((time.perf_counter() - t0) * 1000)
+    assert result["coaching_message"] and result["budget_plan"]["financial_goal"]
+    return statistics.median(samples)
+
+
+def main():
+    profile, transactions = make_inputs()
+
+    linear = FinancialCoachAgent(llm=StubLLM(DELAY_MS))
+    linear.graph = linear._build_graph(LINEAR)
+    fanout = FinancialCoachAgent(llm=StubLLM(DELAY_MS))
+
+    print(f"stub LLM {DELAY_MS:.0f} ms/call, median of {RUNS} runs")
+    before = time_graph(linear, profile, transactions)
+    after = time_graph(fanout, profile, transactions)
+    print(f"{'linear':<8} {before:8.0f} ms  ({linear.llm.calls // RUNS} calls/run)")
+    print(f"{'fan-out':<8} {after:8.0f} ms  ({fanout.llm.calls // RUNS} calls/run, {before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Per-request cost of authenticating a bearer token:
+
+  db lookup   - decode JWT + SELECT the user every time (the old behaviour)
+  cached      - get_current_user with the identity cache warm
+  claims      - get_current_principal with AUTH_TOKEN_CLAIMS (no lookup)
+
+    BENCH_USER_ID=7 python -m benchmarks.auth_overhead
+"""
+import asyncio
+import os
+import statistics
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core import auth_bearer
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.auth_service import create_access_token
+
+USER_ID = int(os.environ.get("BENCH_USER_ID", "1"))
+RUNS = int(os.environ.get("BENCH_RUNS", "500"))
+
+
+async def measure(dependency) -> tuple[float, float]:
+    token = create_access_token({"sub": str(USER_ID), "active": True})
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    samples = []
+    for _ in range(RUNS):
+        # a fresh session per call, like one request
+        async with AsyncSessionLocal() as db:
+            t0 = time.perf_counter()
+            await dependency(creds, db)
+            samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+async def main():
+    settings.AUTH_USER_CACHE_TTL_SECONDS = 0
+    lookup = await measure(auth_bearer.get_current_user)
+
+    settings.AUTH_USER_CACHE_TTL_SECONDS = 60
+    cached = await measure(auth_bearer.get_current_user)
+
+    settings.AUTH_TOKEN_CLAIMS = True
+    claims = await measure(auth_bearer.get_current_principal)
+
+    for name, (p50, p99) in (("db lookup", lookup), ("cached", cached), ("claims", claims)):
+        print(f"{name:10s} p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
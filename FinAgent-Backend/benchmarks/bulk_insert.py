@@ -0,0 +1,98 @@
+"""
+Rows/sec of the one-at-a-time create_transaction path vs the chunked
+multi-row INSERT used by POST /transactions/bulk.
+
+    BENCH_USER_ID=7 python -m benchmarks.bulk_insert            # 2000 rows
+    BENCH_USER_ID=7 BENCH_ROWS=5000 python -m benchmarks.bulk_insert
+
+BENCH_USER_ID is required and should be a throwaway account. Rows are
+tagged source='bench' and deleted afterwards through delete_transactions,
+so the user's rollups and cached summaries end where they started.
+"""
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.models.transactions import Transaction
+from app.schemas.transaction import TransactionCreate
+from app.services.transaction_service import (
+    create_transaction, bulk_create_transactions, delete_transactions, BULK_CHUNK_SIZE
+)
+
+ROWS = int(os.environ.get("BENCH_ROWS", "2000"))
+
+
+def make_payloads(n: int) -> list[TransactionCreate]:
+    start = datetime.utcnow() - timedelta(days=365)
+    return [
+        TransactionCreate(
+            amount=round(random.uniform(1, 500), 2),
+            type=random.choice(["debit", "credit"]),
+            merchant=f"Merchant {i % 50}",
+            category=random.choice(["Food", "Travel", "Bills", "Shopping"]),
+            date=start + timedelta(minutes=i),
+            source="bench",
+        )
+        for i in range(n)
+    ]
+
+
+def bench_user_id() -> int:
+    """ The benchmarks write real rows, so never fall back to some existing user """
+    raw = os.environ.get("BENCH_USER_ID")
+    if not raw:
+        raise SystemExit("Set BENCH_USER_ID to a dedicated benchmark user; its transactions get written and deleted")
+    return int(raw)
+
+
+async def cleanup(user_id: int):
+    """ Delete the bench rows the way the API does, taking them back out of the rollups """
+    async with AsyncSessionLocal() as db:
+        res = await db.execute(
+            select(Transaction.id).where(Transaction.user_id == user_id, Transaction.source == "bench")
+        )
+        ids = res.scalars().all()
+        for start in range(0, len(ids), BULK_CHUNK_SIZE):
+            await delete_transactions(db, user_id, ids[start:start + BULK_CHUNK_SIZE])
+
+
+async def run_single(user_id: int, payloads) -> float:
+    async with AsyncSessionLocal() as db:
+        t0 = time.perf_counter()
+        for p in payloads:
+            await create_transaction(db, user_id, p)
+        return time.perf_counter() - t0
+
+
+async def run_bulk(user_id: int, payloads) -> float:
+    async with AsyncSessionLocal() as db:
+        t0 = time.perf_counter()
+        await bulk_create_transactions(db, user_id, payloads)
+        return time.perf_counter() - t0
+
+
+async def main():
+    user_id = bench_user_id()
+    payloads = make_payloads(ROWS)
+
+    await cleanup(user_id)
+    try:
+        single = await run_single(user_id, payloads)
+        await cleanup(user_id)
+        bulk = await run_bulk(user_id, payloads)
+    finally:
+        await cleanup(user_id)
+
+    print(f"rows:        {ROWS}")
+    print(f"one-at-a-time: {single:8.2f}s  {ROWS / single:10.1f} rows/s")
+    print(f"bulk insert:   {bulk:8.2f}s  {ROWS / bulk:10.1f} rows/s")
+    print(f"speedup:       {single / bulk:8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Latency of filtering transactions client-side (download everything, filter
+in Python) vs pushing the filter into SQL via list_transactions.
+
+    BENCH_USER_ID=7 python -m benchmarks.filtered_listing
+    BENCH_USER_ID=7 BENCH_ROWS=50000 python -m benchmarks.filtered_listing
+
+Seeds BENCH_ROWS rows tagged source='bench' for the (required, throwaway)
+BENCH_USER_ID and deletes them afterwards, rollups included.
+"""
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.models.transactions import Transaction
+from app.schemas.transaction import TransactionFilter
+from app.services.transaction_service import bulk_create_transactions, list_transactions, MAX_PAGE_SIZE
+from benchmarks.bulk_insert import make_payloads, bench_user_id, cleanup
+
+ROWS = int(os.environ.get("BENCH_ROWS", "20000"))
+RUNS = int(os.environ.get("BENCH_RUNS", "20"))
+
+CASES = {
+    "category=Food": TransactionFilter(categories=["Food"]),
+    "merchant^=merchant 1": TransactionFilter(merchant_prefix="merchant 1"),
+    "last 30 days": TransactionFilter(date_from=datetime.utcnow() - timedelta(days=30)),
+    "debit, 100..200": TransactionFilter(type="debit", min_amount=100, max_amount=200),
+}
+
+
+def client_side(rows, f: TransactionFilter):
+    out = []
+    for tx in rows:
+        if f.date_from and tx.date.replace(tzinfo=None) < f.date_from:
+            continue
+        if f.categories and tx.category not in f.categories:
+            continue
+        if f.merchant_prefix and not (tx.merchant or "").lower().startswith(f.merchant_prefix):
+            continue
+        if f.type and tx.type != f.type:
+            continue
+        if f.min_amount is not None and tx.amount < f.min_amount:
+            continue
+        if f.max_amount is not None and tx.amount > f.max_amount:
+            continue
+        out.append(tx)
+    return out
+
+
+async def time_it(fn) -> float:
+    samples = []
+    for _ in range(RUNS):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    user_id = bench_user_id()
+    async with AsyncSessionLocal() as db:
+        await bulk_create_transactions(db, user_id, make_payloads(ROWS))
+
+        try:
+            for name, f in CASES.items():
+                async def download_all():
+                    res = await db.execute(
+                        select(Transaction)
+                        .where(Transaction.user_id == user_id)
+                        .order_by(Transaction.date.desc())
+                    )
+                    client_side(res.scalars().all(), f)
+                    db.expunge_all()
+
+                async def server_side():
+                    await list_transactions(db, user_id, MAX_PAGE_SIZE, None, f)
+                    db.expunge_all()
+
+                before = await time_it(download_all)
+                after = await time_it(server_side)
+                print(f"{name:24s} client-side {before:8.1f} ms   SQL filter {after:8.1f} ms   {before / after:5.1f}x")
+        finally:
+            await cleanup(user_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Latency of an unrelated endpoint while logins hammer the same server.
+
+Start the API (single worker makes event-loop blocking obvious):
+    uvicorn app.main:app --workers 1
+
+then:
+    BENCH_EMAIL=a@b.c BENCH_PASSWORD=secret python -m benchmarks.login_load
+
+With argon2 on the event loop, every login stalls GET / for the duration of
+a hash; with the thread pool the probe's p99 should stay near its idle value.
+"""
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+BASE_URL = os.environ.get("BENCH_BASE_URL", "http://127.0.0.1:8000")
+EMAIL = os.environ.get("BENCH_EMAIL", "bench@example.com")
+PASSWORD = os.environ.get("BENCH_PASSWORD", "bench-password")
+LOGIN_CONCURRENCY = int(os.environ.get("BENCH_LOGINS", "16"))
+DURATION = float(os.environ.get("BENCH_SECONDS", "15"))
+PROBE_INTERVAL = 0.02
+
+
+def pct(samples, p):
+    samples = sorted(samples)
+    return samples[max(0, int(len(samples) * p) - 1)]
+
+
+async def login_loop(client: httpx.AsyncClient, stop: float, done: list):
+    while time.perf_counter() < stop:
+        t0 = time.perf_counter()
+        r = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+        r.raise_for_status()
+        done.append((time.perf_counter() - t0) * 1000)
+
+
+async def probe_loop(client: httpx.AsyncClient, stop: float, samples: list):
+    while time.perf_counter() < stop:
+        t0 = time.perf_counter()
+        await client.get("/")
+        samples.append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(PROBE_INTERVAL)
+
+
+async def run(logins: int) -> tuple[list, list]:
+    probe, login = [], []
+    limits = httpx.Limits(max_connections=logins + 4)
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=limits, timeout=60) as client:
+        stop = time.perf_counter() + DURATION
+        await asyncio.gather(
+            probe_loop(client, stop, probe),
+            *(login_loop(client, stop, login) for _ in range(logins)),
+        )
+    return probe, login
+
+
+async def main():
+    for logins in (0, LOGIN_CONCURRENCY):
+        probe, login = await run(logins)
+        print(f"concurrent logins: {logins}")
+        print(f"  GET /   p50 {statistics.median(probe):8.1f} ms   p99 {pct(probe, 0.99):8.1f} ms   n={len(probe)}")
+        if login:
+            print(f"  login   p50 {statistics.median(login):8.1f} ms   p99 {pct(login, 0.99):8.1f} ms   "
+                  f"{len(login) / DURATION:6.1f}/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+"""
+Throughput of one fleet nudger pass (app.services.nudger.run_fleet) over a
+synthetic fleet, with every database round trip replaced by a fixed delay.
+
+    python -m benchmarks.nudger
+    BENCH_USERS=100000 BENCH_DB_MS=3 python -m benchmarks.nudger
+
+No database needed: the stub session answers the scan, the spending
+summary and the writes the way Postgres would and sleeps BENCH_DB_MS per
+statement, so the number is the pipeline (queueing, concurrency, alert
+rules, batching) under a given round-trip latency. BENCH_CHANGED is the
+share of users with new transactions since their watermark.
+"""
+import asyncio
+import json
+import os
+import random
+from types import SimpleNamespace
+
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.sql.selectable import Select
+
+from app.core.config import settings
+from app.services.nudger import run_fleet
+
+USERS = int(os.environ.get("BENCH_USERS", "100000"))
+DB_MS = float(os.environ.get("BENCH_DB_MS", "2"))
+CHANGED = float(os.environ.get("BENCH_CHANGED", "0.3"))
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class StubSession:
+    """ Just enough AsyncSession for the nudger's statements """
+
+    next_id = 0
+
+    def __init__(self, fleet: dict):
+        self.fleet = fleet
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt, params=None):
+        await asyncio.sleep(DB_MS / 1000)
+        if isinstance(stmt, Select):
+            after, limit = stmt.compile().params.values()
+            ids = range(after + 1, min(after + limit, USERS) + 1)
+            return _Result([SimpleNamespace(id=i, **self.fleet[i]) for i in ids])
+        if isinstance(stmt, TextClause):
+            # SPENDING_SQL: per-category spend; a third of users overspend
+            rng = random.Random(params["user_id"])
+            income = 3000.0
+            spent = income * rng.choice([0.6, 0.9, 1.2])
+            return _Result([
+                SimpleNamespace(days=30, category="Food", spent=spent * 0.6, income=income, n=40),
+                SimpleNamespace(days=30, category="Travel", spent=spent * 0.4, income=0.0, n=10),
+            ])
+        return _Result([])   # watermark upserts
+
+    def add_all(self, rows):
+        for row in rows:
+            StubSession.next_id += 1
+            row.id = StubSession.next_id
+
+    async def commit(self):
+        await asyncio.sleep(DB_MS / 1000)
+
+    async def refresh(self, row):
+        await asyncio.sleep(DB_MS / 1000)
+
+
+def make_fleet(seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    fleet = {}
+    for user_id in range(1, USERS + 1):
+        latest = rng.randint(1, 10_000)
+        seen = latest - 1 if rng.random() < CHANGED else latest
+        fleet[user_id] = {"latest_tx": latest, "last_transaction_id": seen}
+    return fleet
+
+
+def main():
+    fleet = make_fleet()
+    factory = lambda: StubSession(fleet)
+    print(
+        f"{USERS} users, {CHANGED:.0%} changed, {DB_MS:g} ms per statement, "
+        f"concurrency {settings.NUDGER_CONCURRENCY}, batch {settings.NUDGER_BATCH_SIZE}"
+    )
+    result = asyncio.run(run_fleet(session_factory=factory))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from celery import Celery
+from celery.schedules import crontab
+from celery.signals import celeryd_init
+from app.core.config import settings
+
+celery_app = Celery(
+    "finagent",
+    broker=settings.REDIS_URL,
+    backend=settings.REDIS_URL,
+    include=[
+        "workers.tasks.csv_tasks",
+        "workers.tasks.advisor_tasks",
+        "workers.tasks.nudger_tasks",
+        "workers.tasks.goal_tasks",
+    ],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    task_acks_late=True,            # a crashed worker hands the job back instead of losing it
+    worker_prefetch_multiplier=1,   # imports are long; don't hoard them on one worker
+    task_routes={
+        "workers.tasks.csv_tasks.*": {"queue": "imports"},
+        "workers.tasks.advisor_tasks.*": {"queue": "advisor"},
+        "workers.tasks.nudger_tasks.*": {"queue": "nudger"},
+        "workers.tasks.goal_tasks.*": {"queue": "nudger"},   # nightly batch jobs share one worker
+    },
+    beat_schedule={
+        "nightly-nudger": {
+            "task": "workers.tasks.nudger_tasks.run_nudger",
+            "schedule": crontab(hour=settings.NUDGER_HOUR_UTC, minute=0),
+        },
+        "advisor-stale-jobs": {
+            "task": "workers.tasks.advisor_tasks.expire_stale_jobs",
+            "schedule": float(settings.ADVISOR_SWEEP_SECONDS),
+        },
+        "nightly-goal-projections": {
+            "task": "workers.tasks.goal_tasks.project_goals",
+            "schedule": crontab(hour=settings.GOAL_PROJECTIONS_HOUR_UTC, minute=0),
+        },
+    },
+    timezone="UTC",
+)
+
+# Each queue gets its own worker pool so LLM-bound coaching and imports scale
+# independently:
+#     celery -A workers.celery_app worker -Q imports
+#     celery -A workers.celery_app worker -Q advisor
+# The nudger fans out inside its one task (NUDGER_CONCURRENCY), so one process is enough
+QUEUE_CONCURRENCY = {
+    "imports": settings.IMPORT_WORKER_CONCURRENCY,
+    "advisor": settings.ADVISOR_WORKER_CONCURRENCY,
+    "nudger": 1,
+}
+
+
+@celeryd_init.connect
+def _queue_concurrency(sender=None, conf=None, options=None, **kwargs):
+    # Only the default: a worker started with -c keeps what it was given
+    queues = (options or {}).get("queues") or []
+    if isinstance(queues, str):
+        queues = queues.split(",")
+    if len(queues) == 1 and queues[0] in QUEUE_CONCURRENCY:
+        conf.worker_concurrency = QUEUE_CONCURRENCY[queues[0]]
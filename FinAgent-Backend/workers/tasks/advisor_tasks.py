@@ -0,0 +1,127 @@
+"""
+Background advisor replies.
+
+POST /advisor/message stores the user's text, creates an AdvisorJob row and
+enqueues `run_advisor`. The task runs the LangGraph coaching pipeline over
+the user's recent transactions, answers the message in that context and
+saves the answer as a sender="advisor" Conversation row, which is also
+pushed to the user's open WebSockets. GET /advisor/jobs/{job_id} polls it.
+
+A hard time limit kill or a lost worker never reaches the task's own error
+handling, so beat runs `expire_stale_jobs` every ADVISOR_SWEEP_SECONDS to
+fail jobs that have been "running" for longer than the time limit allows.
+
+Run the scheduler and a worker with:
+    celery -A workers.celery_app beat
+    celery -A workers.celery_app worker -Q advisor
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from celery.exceptions import SoftTimeLimitExceeded
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.models.advisor_job import AdvisorJob
+from app.models.conversation import Conversation
+from app.services.advisor_service import load_agent_inputs, get_agent
+from app.workers.ws import broker, publish_message
+from workers.celery_app import celery_app
+
+def _answer(profile: dict, transactions: list[dict], question: str) -> str:
+    agent = get_agent()
+    if not transactions:
+        # Nothing for the pipeline to analyze; answer from the profile alone
+        result = {"spending_analysis": {}, "insights": [], "recommendations": [], "budget_plan": {}}
+    else:
+        result = agent.coach(profile, transactions)
+    return agent.answer(profile, result, question)
+
+
+async def _set_job(db, job_id: int, **values):
+    await db.execute(update(AdvisorJob).where(AdvisorJob.id == job_id).values(**values))
+    await db.commit()
+
+
+async def _fail_job(job_id: int, error: str):
+    async with AsyncSessionLocal() as db:
+        await _set_job(db, job_id, status="failed", error=error)
+
+
+async def _run_advisor(job_id: int):
+    try:
+        async with AsyncSessionLocal() as db:
+            job = (await db.execute(select(AdvisorJob).where(AdvisorJob.id == job_id))).scalar_one_or_none()
+            if job is None or job.status == "done":
+                return   # deleted, or a redelivery of a job that already finished
+            user_id = job.user_id
+            await _set_job(db, job_id, status="running")
+
+            try:
+                question = (await db.execute(
+                    select(Conversation.message).where(Conversation.id == job.message_id)
+                )).scalar_one()
+                profile, transactions = await load_agent_inputs(db, user_id)
+
+                # The agent is synchronous (graph.invoke / llm.invoke)
+                text = await asyncio.to_thread(_answer, profile, transactions, question)
+
+                reply = Conversation(user_id=user_id, sender="advisor", message=text)
+                db.add(reply)
+                await db.flush()
+                await db.execute(
+                    update(AdvisorJob).where(AdvisorJob.id == job_id).values(status="done", reply_id=reply.id)
+                )
+                await db.commit()
+                await db.refresh(reply)
+            except asyncio.CancelledError:
+                # The soft time limit fired while the loop was waiting (asyncio.run
+                # then cancels us); the cancelled statement may have left this
+                # connection mid-query, so record it through a fresh session
+                await _fail_job(job_id, "timed out")
+                raise
+            except Exception as e:
+                await db.rollback()
+                error = "timed out" if isinstance(e, SoftTimeLimitExceeded) else str(e)[:500]
+                await _set_job(db, job_id, status="failed", error=error)
+                raise
+
+        await publish_message(reply)
+    finally:
+        # pooled connections (DB and Redis) are bound to this task's event loop
+        await engine.dispose()
+        await broker.close()
+
+
+@celery_app.task(
+    name="workers.tasks.advisor_tasks.run_advisor",
+    time_limit=settings.ADVISOR_TASK_TIME_LIMIT,
+    soft_time_limit=settings.ADVISOR_TASK_TIME_LIMIT - 10,
+)
+def run_advisor(job_id: int):
+    asyncio.run(_run_advisor(job_id))
+
+
+async def _expire_stale_jobs() -> int:
+    # status="running" refreshes updated_at when the task starts, and the hard
+    # limit kills it ADVISOR_TASK_TIME_LIMIT later; the sweep interval is slack
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.ADVISOR_TASK_TIME_LIMIT + settings.ADVISOR_SWEEP_SECONDS
+    )
+    try:
+        async with AsyncSessionLocal() as db:
+            res = await db.execute(
+                update(AdvisorJob)
+                .where(AdvisorJob.status == "running", AdvisorJob.updated_at < cutoff)
+                .values(status="failed", error="timed out")
+            )
+            await db.commit()
+            return res.rowcount
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="workers.tasks.advisor_tasks.expire_stale_jobs")
+def expire_stale_jobs() -> int:
+    return asyncio.run(_expire_stale_jobs())
@@ -0,0 +1,94 @@
+"""
+Background statement import.
+
+POST /transactions/import spools the upload to disk, creates an ImportJob
+row and enqueues `import_statement`. The task streams the file in
+IMPORT_CHUNK_ROWS-sized chunks, normalizes each one and bulk-inserts it as
+source='csv' transactions, updating the job's progress after every chunk.
+
+Run a worker with:
+    celery -A workers.celery_app worker -Q imports
+"""
+import asyncio
+import os
+
+from sqlalchemy import select, update
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.models.import_job import ImportJob
+from app.schemas.transaction import TransactionCreate
+from app.services.statement_parser import infer_columns, iter_statement_chunks, normalize_chunk
+from app.services.transaction_service import bulk_create_transactions
+from workers.celery_app import celery_app
+
+
+async def _set_job(db, job_id: int, **values):
+    await db.execute(update(ImportJob).where(ImportJob.id == job_id).values(**values))
+    await db.commit()
+
+
+async def _run_import(job_id: int, user_id: int, path: str):
+    try:
+        async with AsyncSessionLocal() as db:
+            job = (await db.execute(select(ImportJob).where(ImportJob.id == job_id))).scalar_one_or_none()
+            if job is None or job.status in ("done", "failed"):
+                return   # deleted, or a redelivery of a job that already finished
+
+            # task_acks_late hands a crashed import back to the queue; pick up
+            # after the last committed chunk instead of importing it all again
+            resume_at = job.rows_processed or 0
+            processed, inserted, skipped = resume_at, job.rows_inserted or 0, job.rows_skipped or 0
+            await _set_job(db, job_id, status="running")
+
+            offset = 0
+            mapping = None
+            try:
+                for chunk in iter_statement_chunks(path, settings.IMPORT_CHUNK_ROWS):
+                    if mapping is None:
+                        mapping = infer_columns(chunk.columns)
+
+                    start, offset = offset, offset + len(chunk)
+                    if offset <= resume_at:
+                        continue
+                    if start < resume_at:
+                        chunk = chunk.iloc[resume_at - start:]
+
+                    rows, bad = normalize_chunk(chunk, mapping)
+                    processed += len(chunk)
+                    skipped += bad
+                    progress = update(ImportJob).where(ImportJob.id == job_id).values(
+                        rows_processed=processed,
+                        rows_inserted=inserted + len(rows),
+                        rows_skipped=skipped,
+                    )
+                    # Progress rides the chunk's own commit, so rows_processed
+                    # never disagrees with what is actually imported
+                    await db.execute(progress)
+                    if rows:
+                        created = await bulk_create_transactions(
+                            db, user_id, [TransactionCreate(**r) for r in rows]
+                        )
+                        inserted += len(created)
+                    else:
+                        await db.commit()
+
+                await _set_job(db, job_id, status="done")
+            except Exception as e:
+                # chunks committed before the failure stay imported; the counters say how far we got
+                await db.rollback()
+                await _set_job(db, job_id, status="failed", error=str(e)[:500])
+    finally:
+        # pooled connections (DB and Redis) are bound to this task's event loop
+        await engine.dispose()
+        await cache.close()
+
+
+@celery_app.task(name="workers.tasks.csv_tasks.import_statement")
+def import_statement(job_id: int, user_id: int, path: str):
+    try:
+        asyncio.run(_run_import(job_id, user_id, path))
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
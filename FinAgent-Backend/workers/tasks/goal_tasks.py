@@ -0,0 +1,30 @@
+"""
+Nightly goal projections.
+
+Celery beat enqueues `project_goals` once a day; the task reruns the
+forecast for every user with goals (app.services.goal_forecast.precompute_all)
+so GET /goals/projections reads current rows from goal_projections.
+
+Run the scheduler and a worker with:
+    celery -A workers.celery_app beat
+    celery -A workers.celery_app worker -Q nudger
+"""
+import asyncio
+
+from app.core.database import AsyncSessionLocal, engine
+from app.services.goal_forecast import precompute_all
+from workers.celery_app import celery_app
+
+
+async def _project_goals() -> int:
+    try:
+        async with AsyncSessionLocal() as db:
+            return await precompute_all(db)
+    finally:
+        # pooled connections are bound to this task's event loop
+        await engine.dispose()
+
+
+@celery_app.task(name="workers.tasks.goal_tasks.project_goals")
+def project_goals() -> int:
+    return asyncio.run(_project_goals())
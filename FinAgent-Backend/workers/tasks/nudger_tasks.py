@@ -0,0 +1,31 @@
+"""
+Nightly fleet nudger.
+
+Celery beat enqueues `run_nudger` once a day at NUDGER_HOUR_UTC; the task
+makes one pass over all active users (app.services.nudger.run_fleet) and
+returns its throughput / stage timings as the task result.
+
+Run the scheduler and a worker with:
+    celery -A workers.celery_app beat
+    celery -A workers.celery_app worker -Q nudger
+"""
+import asyncio
+
+from app.core.database import engine
+from app.services.nudger import run_fleet
+from app.workers.ws import broker
+from workers.celery_app import celery_app
+
+
+async def _run_nudger() -> dict:
+    try:
+        return await run_fleet()
+    finally:
+        # pooled connections (DB and Redis) are bound to this task's event loop
+        await engine.dispose()
+        await broker.close()
+
+
+@celery_app.task(name="workers.tasks.nudger_tasks.run_nudger")
+def run_nudger() -> dict:
+    return asyncio.run(_run_nudger())